@@ -3,6 +3,8 @@ import os
 import yaml
 import json
 from PedsimAgent import *
+from PedsimAgentTable import *
+from ScenarioBinaryFormat import *
 from FlatlandModel import *
 from HelperFunctions import *
 
@@ -10,6 +12,7 @@ from HelperFunctions import *
 class ArenaScenario:
     def __init__(self):
         self.pedsimAgents = []  # list of PedsimAgent objects
+        self.pedsimAgentTable = None  # PedsimAgentTable, replaces pedsimAgents if the scenario was loaded columnar
         self.interactiveObstacles = []  # list of InteractiveObstacle messages
         self.staticObstacles = []  # list of FlatlandObjects
         self.robotPosition = np.zeros(2)  # starting position of robot
@@ -21,7 +24,10 @@ class ArenaScenario:
     def toDict(self):
         d = {}
 
-        d["pedsim_agents"] = [a.toDict() for a in self.pedsimAgents]
+        if self.pedsimAgentTable is not None:
+            d["pedsim_agents"] = self.pedsimAgentTable.toDicts()
+        else:
+            d["pedsim_agents"] = [a.toDict() for a in self.pedsimAgents]
         d["static_obstacles"] = [o.toDict() for o in self.staticObstacles]
         # d["interactive_obstacles"] = TODO...
         d["robot_position"] = [float(value) for value in self.robotPosition]
@@ -33,21 +39,31 @@ class ArenaScenario:
         return d
 
     @staticmethod
-    def fromDict(d: dict):
+    def fromDict(d: dict, columnar: bool = False, convert_paths: bool = True):
         scenario = ArenaScenario()
-        scenario.loadFromDict(d)
+        scenario.loadFromDict(d, columnar, convert_paths)
         return scenario
 
-    def loadFromDict(self, d: dict):
-        self.pedsimAgents = [PedsimAgent.fromDict(
-            a) for a in d["pedsim_agents"]]
+    def loadFromDict(self, d: dict, columnar: bool = False, convert_paths: bool = True):
+        '''
+        - columnar: store pedsim agents in self.pedsimAgentTable instead of creating a PedsimAgent object for each
+        - convert_paths: convert model and map paths to the current user (see get_current_user_path()),
+            should be False if the paths are already valid on this machine
+        '''
+        if columnar:
+            self.pedsimAgents = []
+            self.pedsimAgentTable = PedsimAgentTable.fromDicts(d["pedsim_agents"], convert_paths)
+        else:
+            self.pedsimAgents = [PedsimAgent.fromDict(
+                a, convert_paths) for a in d["pedsim_agents"]]
+            self.pedsimAgentTable = None
         self.staticObstacles = [FlatlandObject.fromDict(
-            o) for o in d["static_obstacles"]]
+            o, convert_paths) for o in d["static_obstacles"]]
         # self.interactiveObstacles = ...TODO
         self.robotPosition = np.array(
             [d["robot_position"][0], d["robot_position"][1]])
         self.robotGoal = np.array([d["robot_goal"][0], d["robot_goal"][1]])
-        self.mapPath = get_current_user_path(d["map_path"])
+        self.mapPath = get_current_user_path(d["map_path"]) if convert_paths else d["map_path"]
         if ("resets") in d.keys():
             self.resets = d["resets"]
         else:
@@ -57,7 +73,7 @@ class ArenaScenario:
         '''
         Save Scenario in file.
         - path_in: path to save file
-        - format: format of save file, can be "json" or "yaml"
+        - format: format of save file, can be "json", "yaml" or "arenabin" (binary, see ScenarioBinaryFormat.py)
         '''
         if os.path.exists(path_in):  # TODO is this not always false when it's a new filename?
             self.path = path_in
@@ -66,32 +82,64 @@ class ArenaScenario:
             return False
 
         _, file_extension = os.path.splitext(self.path)
+        if file_extension == BINARY_SCENARIO_FILE_ENDING:
+            save_binary_scenario(self.toDict(), self.path)
+            return True
+
         with open(self.path, "w") as file:
             data = self.toDict()
             if file_extension == ".json":
-                json.dump(data, file, indent=4)
+                dump_json(data, file)
             elif file_extension == ".yaml":
-                yaml.dump(data, file, default_flow_style=None)
+                dump_yaml(data, file, default_flow_style=None)
             else:
                 raise Exception(
-                    "wrong format. file needs to have 'json' or 'yaml' file ending.")
+                    "wrong format. file needs to have 'json', 'yaml' or 'arenabin' file ending.")
 
         return True
 
-    def loadFromFile(self, path_in: str):
+    def loadFromDictAndTable(self, d: dict, pedsimAgentTable: PedsimAgentTable, columnar: bool = False,
+                             convert_paths: bool = True):
+        '''
+        Load a scenario whose agents are stored separately in a table, like in binary scenarios.
+        - d: scenario dict, its pedsim agents are ignored
+        - columnar: keep the table in self.pedsimAgentTable instead of creating PedsimAgent objects
+        - convert_paths: see loadFromDict(), model paths in the table are used as they are
+        '''
+        self.loadFromDict(dict(d, pedsim_agents=[]), convert_paths=convert_paths)
+        if columnar:
+            self.pedsimAgentTable = pedsimAgentTable
+        else:
+            self.pedsimAgents = pedsimAgentTable.toAgents()
+
+    def getPedsimAgents(self) -> list:
+        '''
+        Return the pedsim agents as PedsimAgent objects, no matter how they are stored.
+        '''
+        if self.pedsimAgentTable is not None:
+            return self.pedsimAgentTable.toAgents()
+        return self.pedsimAgents
+
+    def loadFromFile(self, path_in: str, columnar: bool = False):
         if os.path.exists(path_in):
             _, file_extension = os.path.splitext(path_in)
+            if file_extension == BINARY_SCENARIO_FILE_ENDING:
+                data, table = load_binary_scenario(path_in)
+                self.loadFromDictAndTable(data, table, columnar)
+                self.path = path_in
+                return
+
             with open(path_in, "r") as f:
                 data = None
                 if file_extension == ".json":
-                    data = json.load(f)
+                    data = load_json(f)
                 elif file_extension == ".yaml":
-                    data = yaml.safe_load(f)
+                    data = load_yaml(f)
                 else:
                     raise Exception(
-                        "wrong format. file needs to have 'json' or 'yaml' file ending.")
+                        "wrong format. file needs to have 'json', 'yaml' or 'arenabin' file ending.")
 
-                self.loadFromDict(data)
+                self.loadFromDict(data, columnar)
                 self.path = path_in
 
         else:
@@ -1,3 +1,4 @@
+import contextlib
 import pathlib
 from PyQt5 import QtGui, QtCore, QtWidgets
 import os
@@ -23,7 +24,7 @@ class RosMapData():
         if os.path.exists(path):
             self.path = path
             with open(path, "r") as file:
-                data = yaml.safe_load(file)
+                data = load_yaml(file)
                 folder_path = os.path.dirname(path)
                 self.image_path = os.path.join(folder_path, data["image"])
                 self.resolution = float(data["resolution"])
@@ -31,21 +32,72 @@ class RosMapData():
 
 
 
+def create_flatland_model_shape(model: FlatlandModel) -> Tuple[QtGui.QPainterPath, QtGui.QBrush]:
+    '''
+    Convert the footprints of all bodies of model into a path.
+    Returns the path and a brush with the color of the last body, or None if the model has no bodies.
+    '''
+    painter_path = QtGui.QPainterPath()
+    painter_path.setFillRule(QtCore.Qt.WindingFill)
+    brush = None
+    for body in model.bodies.values():
+        # skip safety distance circle
+        if body.name == "safety_dist_circle":
+            continue
+        # set color
+        brush = QtGui.QBrush(body.color, QtCore.Qt.BrushStyle.SolidPattern)
+        # compose path
+        for footprint in body.footprints:
+            if isinstance(footprint, CircleFlatlandFootprint):
+                center = QtCore.QPointF(footprint.center[0], footprint.center[1])
+                radius = footprint.radius
+                painter_path.addEllipse(center, radius, radius)
+            if isinstance(footprint, PolygonFlatlandFootprint):
+                polygon = QtGui.QPolygonF([QtCore.QPointF(point[0], point[1]) for point in footprint.points])
+                painter_path.addPolygon(polygon)
+    return painter_path, brush
+
+
+class FlatlandModelShapeCache():
+    '''
+    Paths and brushes of flatland models, built once per model and shared by all graphics items using the model.
+    Models are keyed by identity, which works because models from load_flatland_model() are shared and immutable.
+    Unshared models might still be modified, so their shape is built on every call.
+    '''
+    def __init__(self):
+        self.shapes = {}  # key: id(model), value: (model, path, brush), the model is kept so its id can't be reused
+
+    def get(self, model: FlatlandModel) -> Tuple[QtGui.QPainterPath, QtGui.QBrush]:
+        if not model.shared:
+            return create_flatland_model_shape(model)
+        key = id(model)
+        if key not in self.shapes:
+            self.shapes[key] = (model, *create_flatland_model_shape(model))
+        _, painter_path, brush = self.shapes[key]
+        return painter_path, brush
+
+    def clear(self):
+        self.shapes = {}
+
+
+FLATLAND_MODEL_SHAPE_CACHE = FlatlandModelShapeCache()
+
+
+
 class WaypointWidget(QtWidgets.QWidget):
-    def __init__(self, pedsimAgentWidget, graphicsScene: QtWidgets.QGraphicsScene, posIn: QtCore.QPointF = None, **kwargs):
+    '''
+    A row in the waypoint list of a PedsimAgentWidget, shows the position of one waypoint item.
+    '''
+    def __init__(self, pedsimAgentWidget, waypointItem: WaypointGraphicsEllipseItem, **kwargs):
         super().__init__(**kwargs)
         self.id = 0
-        self.pedsimAgentWidget = pedsimAgentWidget  # needed so the ellipse item can trigger a waypoint path redraw
-        # create circle and add to scene
-        self.ellipseItem = WaypointGraphicsEllipseItem(self, None, None, -0.25, -0.25, 0.5, 0.5)
-        self.graphicsScene = graphicsScene
-        graphicsScene.addItem(self.ellipseItem)
+        self.pedsimAgentWidget = pedsimAgentWidget
+        self.waypointItem = waypointItem
         # setup widgets
         self.setupUI()
         self.setId(self.id)
         # set initial position
-        if posIn != None:
-            self.setPos(posIn)
+        self.updateSpinBoxesFromGraphicsItem()
 
     def setupUI(self):
         self.setLayout(QtWidgets.QHBoxLayout())
@@ -79,62 +131,47 @@ class WaypointWidget(QtWidgets.QWidget):
     def setId(self, id: int):
         self.id = id
 
-    def setPos(self, posIn: QtCore.QPointF):
-        # set values of spin boxes (and ellipse item)
-        # since spin boxes are connected to the ellipse item, the change will be propagated
-        self.posXSpinBox.setValue(posIn.x())
-        self.posYSpinBox.setValue(posIn.y())
-
     def getPos(self) -> Tuple[float, float]:
         return self.posXSpinBox.value(), self.posYSpinBox.value()
 
     def updateEllipseItemFromSpinBoxes(self):
-        if not self.ellipseItem.isDragged:  # do this to prevent recursion between spin boxes and graphics item
-            x = self.posXSpinBox.value()
-            y = self.posYSpinBox.value()
-            self.ellipseItem.setPosNoEvent(x, y)  # set without event to prevent recursion between spin boxes and graphics item
+        x, y = self.getPos()
+        self.pedsimAgentWidget.pedsimAgentElement.setWaypointPos(self.waypointItem, x, y)
 
     def updateSpinBoxesFromGraphicsItem(self):
-        new_pos = self.ellipseItem.mapToScene(self.ellipseItem.transformOriginPoint())
-        self.posXSpinBox.setValue(new_pos.x())
-        self.posYSpinBox.setValue(new_pos.y())
+        new_pos = self.waypointItem.mapToScene(self.waypointItem.transformOriginPoint())
+        # block signals to prevent recursion between spin boxes and graphics item
+        set_spin_box_values_no_signal([self.posXSpinBox, self.posYSpinBox], [new_pos.x(), new_pos.y()])
 
     def remove(self):
-        self.ellipseItem.scene().removeItem(self.ellipseItem)
-        del self.ellipseItem.keyPressEater  # delete to remove event filter
-
-        self.parent().layout().removeWidget(self)
-        self.pedsimAgentWidget.updateWaypointIdLabels()
-        self.pedsimAgentWidget.drawWaypointPath()
-        self.deleteLater()
+        self.pedsimAgentWidget.pedsimAgentElement.removeWaypoint(self.waypointItem)
 
 
 
-class PedsimAgentWidget(QtWidgets.QFrame):
+class PedsimAgentElement():
     '''
-    This is a row in the obstacles frame.
+    A pedsim agent in the scene.
+    The graphics items of the agent and its waypoints hold position and waypoints until they are saved into self.pedsimAgent.
+    Widgets for editing (PedsimAgentWidget) are only created while the element is selected in the elements list.
     '''
-    def __init__(self, id: int, pedsimAgentIn: PedsimAgent, graphicsScene: QtWidgets.QGraphicsScene, graphicsView: ArenaQGraphicsView, **kwargs):
-        super().__init__(**kwargs)
+    def __init__(self, id: int, pedsimAgentIn: PedsimAgent, scenarioEditor):
         self.id = id
-        self.graphicsScene = graphicsScene
-        self.graphicsView = graphicsView
+        self.scenarioEditor = scenarioEditor
+        self.graphicsScene = scenarioEditor.gscene
+        self.graphicsView = scenarioEditor.gview
         self.pedsimAgent = pedsimAgentIn
+        self.dirty = False  # True if position or waypoints of the graphics items differ from self.pedsimAgent
+        self.widget = None  # PedsimAgentWidget, only exists while this element is selected in the elements list
 
         # create path item
         self.graphicsPathItem = ArenaGraphicsPathItem(self)
         # add to scene
         self.graphicsScene.addItem(self.graphicsPathItem)
-        # setup widgets
-        self.setup_ui()
-        # setup pedsim agent editor
-        self.pedsimAgentEditor = PedsimAgentEditor(self, parent=self.parent(), flags=QtCore.Qt.WindowType.Window)
-        self.pedsimAgentEditor.editorSaved.connect(self.handleEditorSaved)
 
         # setup waypoints
+        self.waypointItems = []  # list of WaypointGraphicsEllipseItem
         self.addWaypointModeActive = False
-        self.activeModeWindow = ActiveModeWindow(self)
-        graphicsView.clickedPos.connect(self.handleGraphicsViewClick)
+        self.activeModeWindow = None  # ActiveModeWindow, created when the add waypoint mode is first enabled
         # GraphicsItem for drawing a path connecting the waypoints
         self.waypointPathItem = QtWidgets.QGraphicsPathItem()
         ## create brush
@@ -149,116 +186,73 @@ class PedsimAgentWidget(QtWidgets.QFrame):
         pen.setJoinStyle(QtCore.Qt.PenJoinStyle.RoundJoin)
         self.waypointPathItem.setPen(pen)
         ## add to scene
-        graphicsScene.addItem(self.waypointPathItem)
+        self.graphicsScene.addItem(self.waypointPathItem)
 
         self.updateEverythingFromPedsimAgent()
 
-    def setup_ui(self):
-        self.setLayout(QtWidgets.QGridLayout())
-        self.setFrameStyle(QtWidgets.QFrame.Shape.Box | QtWidgets.QFrame.Shadow.Raised)
+    def getName(self) -> str:
+        return self.pedsimAgent.name
 
-        # name label
-        self.name_label = QtWidgets.QLabel(self.pedsimAgent.name)
-        self.layout().addWidget(self.name_label, 0, 0)
+    def getDisplayName(self) -> str:
+        return f"{self.pedsimAgent.name} (pedsim agent)"
 
-        # edit button
-        self.edit_button = QtWidgets.QPushButton("Edit")
-        self.edit_button.clicked.connect(self.onEditClicked)
-        self.layout().addWidget(self.edit_button, 0, 1)
-
-        # delete button
-        self.delete_button = QtWidgets.QPushButton("Delete")
-        self.delete_button.clicked.connect(self.onDeleteClicked)
-        self.layout().addWidget(self.delete_button, 0, 2)
-
-        # position
-        label = QtWidgets.QLabel("Pos:")
-        self.layout().addWidget(label, 1, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
-        self.posXSpinBox = ArenaQDoubleSpinBox()
-        self.posXSpinBox.valueChanged.connect(self.updateGraphicsPathItemFromSpinBoxes)
-        self.layout().addWidget(self.posXSpinBox, 1, 1)
-        self.posYSpinBox = ArenaQDoubleSpinBox()
-        self.posYSpinBox.valueChanged.connect(self.updateGraphicsPathItemFromSpinBoxes)
-        self.layout().addWidget(self.posYSpinBox, 1, 2)
-
-        # waypoints
-        label = QtWidgets.QLabel("Waypoints:")
-        self.layout().addWidget(label, 2, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
-        button = QtWidgets.QPushButton("Add Waypoints...")
-        button.clicked.connect(self.onAddWaypointClicked)
-        self.layout().addWidget(button, 2, 1, 1, -1)
-        self.waypointListWidget = QtWidgets.QWidget()
-        self.waypointListWidget.setLayout(QtWidgets.QVBoxLayout())
-        self.layout().addWidget(self.waypointListWidget, 3, 0, 1, -1)
+    def createWidget(self):
+        return PedsimAgentWidget(self)
 
     def handleMouseDoubleClick(self):
         # function will be called by the graphics item
         self.onEditClicked()
 
     def handleItemChange(self):
-        # function will be called by the graphics item
-        self.updateSpinBoxesFromGraphicsItem()
+        # function will be called by the graphics item after it was moved
+        if self.widget is not None:
+            self.widget.updateSpinBoxesFromGraphicsItem()
+        self.drawWaypointPath()
+        self.markDirty()
+
+    def handleWaypointItemChange(self, waypointItem: WaypointGraphicsEllipseItem):
+        # function will be called by a waypoint item after it was moved
+        if self.widget is not None:
+            self.widget.updateWaypointSpinBoxes(waypointItem)
         self.drawWaypointPath()
+        self.markDirty()
 
     def drawWaypointPath(self):
         path = QtGui.QPainterPath()
         path.moveTo(self.getCurrentAgentPosition())
-        for w in self.getWaypointWidgets():
-            w_pos = w.ellipseItem.mapToScene(w.ellipseItem.transformOriginPoint())
-            path.lineTo(w_pos)
+        for item in self.waypointItems:
+            path.lineTo(item.mapToScene(item.transformOriginPoint()))
 
         self.waypointPathItem.setPath(path)
 
-    def getCurrentAgentPosition(self):
-        x = self.posXSpinBox.value()
-        y = self.posYSpinBox.value()
-        return QtCore.QPointF(x, y)
+    def getCurrentAgentPosition(self) -> QtCore.QPointF:
+        return self.graphicsPathItem.mapToScene(self.graphicsPathItem.transformOriginPoint())
 
-    def getWaypointWidgets(self):
-        widgets = []
-        for i in range(self.waypointListWidget.layout().count()):
-            w = self.waypointListWidget.layout().itemAt(i).widget()
-            if w != None:
-                widgets.append(w)
-        return widgets
-
-    def updateSpinBoxesFromGraphicsItem(self):
-        new_pos = self.graphicsPathItem.mapToScene(self.graphicsPathItem.transformOriginPoint())
-        self.posXSpinBox.setValue(new_pos.x())
-        self.posYSpinBox.setValue(new_pos.y())
+    def getWaypointItems(self) -> List[WaypointGraphicsEllipseItem]:
+        return self.waypointItems
 
-    def updateGraphicsPathItemFromSpinBoxes(self):
+    def setPos(self, x: float, y: float):
+        # function will be called by the spin boxes of the widget
         if not self.graphicsPathItem.isDragged:  # prevents recursive loop (spin box <-> moving item)
-            x = self.posXSpinBox.value()
-            y = self.posYSpinBox.value()
             self.graphicsPathItem.setPosNoEvent(x, y)
-            self.drawWaypointPath()
             self.graphicsPathItem.updateTextItemPos()
+            self.drawWaypointPath()
+        self.markDirty()
+
+    def setWaypointPos(self, waypointItem: WaypointGraphicsEllipseItem, x: float, y: float):
+        # function will be called by the spin boxes of the widget
+        if not waypointItem.isDragged:  # prevents recursive loop (spin box <-> moving item)
+            waypointItem.setPosNoEvent(x, y)
+        self.markDirty()
 
     def updateGraphicsPathItemFromPedsimAgent(self):
         # update path
-        painter_path = QtGui.QPainterPath()
-        painter_path.setFillRule(QtCore.Qt.WindingFill)
-        # get shapes from the agent and convert them to a path
-        for body in self.pedsimAgent.flatlandModel.bodies.values():
-            # skip safety distance circle
-            if body.name == "safety_dist_circle":
-                continue
-            # set color
-            brush = QtGui.QBrush(body.color, QtCore.Qt.BrushStyle.SolidPattern)
+        painter_path, brush = FLATLAND_MODEL_SHAPE_CACHE.get(self.pedsimAgent.flatlandModel)
+        if brush is not None:
             self.graphicsPathItem.setBrush(brush)
-            # compose path
-            for footprint in body.footprints:
-                if isinstance(footprint, CircleFlatlandFootprint):
-                    center = QtCore.QPointF(footprint.center[0], footprint.center[1])
-                    radius = footprint.radius
-                    painter_path.addEllipse(center, radius, radius)
-                if isinstance(footprint, PolygonFlatlandFootprint):
-                    polygon = QtGui.QPolygonF([QtCore.QPointF(point[0], point[1]) for point in footprint.points])
-                    painter_path.addPolygon(polygon)
         self.graphicsPathItem.setPath(painter_path)
         # update text
-        self.graphicsPathItem.textItem.setPlainText(self.name_label.text())
+        self.graphicsPathItem.textItem.setPlainText(self.pedsimAgent.name)
         self.graphicsPathItem.updateTextItemPos()
 
     def setPedsimAgent(self, agent: PedsimAgent):
@@ -267,82 +261,100 @@ class PedsimAgentWidget(QtWidgets.QFrame):
 
     def updateEverythingFromPedsimAgent(self):
         # position
-        self.posXSpinBox.setValue(self.pedsimAgent.pos[0])
-        self.posYSpinBox.setValue(self.pedsimAgent.pos[1])
+        self.graphicsPathItem.setPosNoEvent(self.pedsimAgent.pos[0], self.pedsimAgent.pos[1])
         # waypoints
-        ## remove all waypoint widgets
-        for w in self.getWaypointWidgets():
-            w.remove()
+        ## remove all waypoint items
+        for item in self.waypointItems:
+            self.removeWaypointItem(item)
+        self.waypointItems = []
         ## add new waypoints
         for wp in self.pedsimAgent.waypoints:
-            pos = QtCore.QPointF(wp[0], wp[1])
-            self.addWaypoint(pos)
-        # update name label
-        self.updateNameLabelFromPedsimAgent()
+            self.waypointItems.append(self.createWaypointItem(QtCore.QPointF(wp[0], wp[1])))
+        self.drawWaypointPath()
         # update item scene
         self.updateGraphicsPathItemFromPedsimAgent()
+        # update widgets
+        if self.widget is not None:
+            self.widget.updateEverythingFromPedsimAgentElement()
+        # graphics items now show the values of the agent
+        self.graphicsScene.flushCallsAfterBulkUpdate()
+        self.dirty = False
 
-    def updateNameLabelFromPedsimAgent(self):
-        self.name_label.setText(self.pedsimAgent.name)
+    def markDirty(self):
+        self.dirty = True
 
     def handleEditorSaved(self):
         # editor was saved, update possibly changed values
-        self.updateNameLabelFromPedsimAgent()
         self.updateGraphicsPathItemFromPedsimAgent()
-
-    def updateWaypointIdLabels(self):
-        widgets = self.getWaypointWidgets()
-        for i, w in enumerate(widgets):
-            w.setId(i)
-
-    # @pyqtSlot(QtCore.QPointF)
-    def handleGraphicsViewClick(self, pos: QtCore.QPointF):
-        if self.addWaypointModeActive:
-            self.addWaypoint(pos)
-
-    def addWaypoint(self, pos: QtCore.QPointF = None):
-        w = WaypointWidget(self, self.graphicsScene, pos, parent=self)
-        self.waypointListWidget.layout().addWidget(w)
-        self.updateWaypointIdLabels()
+        self.scenarioEditor.updateElementInList(self)
+        if self.widget is not None:
+            self.widget.updateNameLabelFromPedsimAgent()
+
+    def createWaypointItem(self, pos: QtCore.QPointF) -> WaypointGraphicsEllipseItem:
+        item = WaypointGraphicsEllipseItem(self, None, None, -0.25, -0.25, 0.5, 0.5)
+        # items outside of a scene don't notify this element, so the position can be set without toggling flags
+        item.setPos(pos)
+        self.graphicsScene.addItem(item)
+        return item
+
+    def removeWaypointItem(self, waypointItem: WaypointGraphicsEllipseItem):
+        self.graphicsScene.removeItem(waypointItem)
+
+    def addWaypoint(self, pos: QtCore.QPointF):
+        self.waypointItems.append(self.createWaypointItem(pos))
         self.drawWaypointPath()
+        self.markDirty()
+        if self.widget is not None:
+            self.widget.updateWaypointWidgets()
 
-    def removeWaypoint(self, waypointWidget: WaypointWidget):
-        self.waypointListWidget.layout().removeWidget(waypointWidget)
-        self.updateWaypointIdLabels()
+    def removeWaypoint(self, waypointItem: WaypointGraphicsEllipseItem):
+        self.removeWaypointItem(waypointItem)
+        self.waypointItems.remove(waypointItem)
         self.drawWaypointPath()
+        self.markDirty()
+        if self.widget is not None:
+            self.widget.updateWaypointWidgets()
 
     def setAddWaypointMode(self, enable: bool):
         self.addWaypointModeActive = enable
+        self.scenarioEditor.updateAddWaypointMode(self)
         if enable:
+            if self.activeModeWindow is None:
+                self.activeModeWindow = ActiveModeWindow(self)
             self.activeModeWindow.show()
-        else:
+        elif self.activeModeWindow is not None:
             self.activeModeWindow.hide()
 
     def save(self):
         # saves position and waypoints to the pedsim agent
         # all other attributes should have already been saved by the PedsimAgentEditor
+        if not self.dirty:
+            return
         # position
-        pos_x = self.posXSpinBox.value()
-        pos_y = self.posYSpinBox.value()
-        self.pedsimAgent.pos = np.array([pos_x, pos_y])
+        pos = self.getCurrentAgentPosition()
+        self.pedsimAgent.pos = np.array([pos.x(), pos.y()])
         # waypoints
         self.pedsimAgent.waypoints = []
-        for w in self.getWaypointWidgets():
-            x, y = w.getPos()
-            self.pedsimAgent.waypoints.append(np.array([x, y]))
+        for item in self.waypointItems:
+            wp = item.mapToScene(item.transformOriginPoint())
+            self.pedsimAgent.waypoints.append(np.array([wp.x(), wp.y()]))
+        self.dirty = False
 
-    def remove(self):
+    def removeGraphicsItems(self):
         # remove waypoints
-        for w in self.getWaypointWidgets():
-            w.remove()
+        for item in self.waypointItems:
+            self.removeWaypointItem(item)
+        self.waypointItems = []
         # remove items from scene
         self.graphicsScene.removeItem(self.graphicsPathItem)
         self.graphicsScene.removeItem(self.graphicsPathItem.textItem)
         self.graphicsScene.removeItem(self.waypointPathItem)
-        del self.graphicsPathItem.keyPressEater  # delete to remove event filter
-        # remove widget
-        self.parent().layout().removeWidget(self)
-        self.deleteLater()
+        self.setAddWaypointMode(False)
+
+    def remove(self):
+        self.removeGraphicsItems()
+        # remove from elements list
+        self.scenarioEditor.removeElement(self)
 
     def onAddWaypointClicked(self):
         if self.addWaypointModeActive:
@@ -351,47 +363,40 @@ class PedsimAgentWidget(QtWidgets.QFrame):
             self.setAddWaypointMode(True)
 
     def onEditClicked(self):
-        self.pedsimAgentEditor.show()
+        self.scenarioEditor.editPedsimAgent(self)
 
     def onDeleteClicked(self):
         self.remove()
 
 
 
-class FlatlandObjectWidget(QtWidgets.QFrame):
+class PedsimAgentWidget(QtWidgets.QFrame):
     '''
-    This is a row in the obstacles frame.
+    Widgets for editing the pedsim agent selected in the elements list.
     '''
-    def __init__(self, id: int, flatlandObjectIn: FlatlandObject, graphicsScene: QtWidgets.QGraphicsScene, graphicsView: ArenaQGraphicsView, **kwargs):
+    def __init__(self, pedsimAgentElement: PedsimAgentElement, **kwargs):
         super().__init__(**kwargs)
-        self.id = id
-        self.graphicsScene = graphicsScene
-        self.graphicsView = graphicsView
-        self.flatlandObject = flatlandObjectIn
-        # self.modelPath = flatlandObjectIn.flatlandModel.path
-
-        # create graphics path item
-        self.graphicsPathItem = ArenaGraphicsPathItem(self)
-        ## add to scene
-        self.graphicsScene.addItem(self.graphicsPathItem)
-
+        self.pedsimAgentElement = pedsimAgentElement
+        # setup widgets
         self.setup_ui()
-
-        self.graphicsPathItem.textItem.setPlainText(self.name_label.text())
-
-        self.updateEverythingFromFlatlandObject()
+        self.updateEverythingFromPedsimAgentElement()
 
     def setup_ui(self):
         self.setLayout(QtWidgets.QGridLayout())
         self.setFrameStyle(QtWidgets.QFrame.Shape.Box | QtWidgets.QFrame.Shadow.Raised)
 
         # name label
-        self.name_label = QtWidgets.QLabel("obstacle" + str(self.id))
+        self.name_label = QtWidgets.QLabel("")
         self.layout().addWidget(self.name_label, 0, 0)
 
+        # edit button
+        self.edit_button = QtWidgets.QPushButton("Edit")
+        self.edit_button.clicked.connect(self.pedsimAgentElement.onEditClicked)
+        self.layout().addWidget(self.edit_button, 0, 1)
+
         # delete button
         self.delete_button = QtWidgets.QPushButton("Delete")
-        self.delete_button.clicked.connect(self.onDeleteClicked)
+        self.delete_button.clicked.connect(self.pedsimAgentElement.onDeleteClicked)
         self.layout().addWidget(self.delete_button, 0, 2)
 
         # position
@@ -404,122 +409,247 @@ class FlatlandObjectWidget(QtWidgets.QFrame):
         self.posYSpinBox.valueChanged.connect(self.updateGraphicsPathItemFromSpinBoxes)
         self.layout().addWidget(self.posYSpinBox, 1, 2)
 
-        # folder
-        folder_label = QtWidgets.QLabel("Model:")
-        self.layout().addWidget(folder_label, 2, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
-        self.browse_button = QtWidgets.QPushButton("Browse...")
-        self.browse_button.clicked.connect(self.onBrowseClicked)
-        self.layout().addWidget(self.browse_button, 2, 1, 1, -1)
+        # waypoints
+        label = QtWidgets.QLabel("Waypoints:")
+        self.layout().addWidget(label, 2, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
+        button = QtWidgets.QPushButton("Add Waypoints...")
+        button.clicked.connect(self.pedsimAgentElement.onAddWaypointClicked)
+        self.layout().addWidget(button, 2, 1, 1, -1)
+        self.waypointListWidget = QtWidgets.QWidget()
+        self.waypointListWidget.setLayout(QtWidgets.QVBoxLayout())
+        self.layout().addWidget(self.waypointListWidget, 3, 0, 1, -1)
 
+    def getWaypointWidgets(self) -> List[WaypointWidget]:
+        widgets = []
+        for i in range(self.waypointListWidget.layout().count()):
+            w = self.waypointListWidget.layout().itemAt(i).widget()
+            if w != None:
+                widgets.append(w)
+        return widgets
+
+    def updateSpinBoxesFromGraphicsItem(self):
+        new_pos = self.pedsimAgentElement.getCurrentAgentPosition()
+        # block signals to prevent recursion between spin boxes and graphics item
+        set_spin_box_values_no_signal([self.posXSpinBox, self.posYSpinBox], [new_pos.x(), new_pos.y()])
+
+    def updateGraphicsPathItemFromSpinBoxes(self):
+        self.pedsimAgentElement.setPos(self.posXSpinBox.value(), self.posYSpinBox.value())
+
+    def updateWaypointSpinBoxes(self, waypointItem: WaypointGraphicsEllipseItem):
+        for w in self.getWaypointWidgets():
+            if w.waypointItem is waypointItem:
+                w.updateSpinBoxesFromGraphicsItem()
+
+    def updateWaypointWidgets(self):
+        ## remove all waypoint widgets
+        for w in self.getWaypointWidgets():
+            self.waypointListWidget.layout().removeWidget(w)
+            w.deleteLater()
+        ## add a waypoint widget for each waypoint item
+        for i, item in enumerate(self.pedsimAgentElement.getWaypointItems()):
+            w = WaypointWidget(self, item, parent=self)
+            w.setId(i)
+            self.waypointListWidget.layout().addWidget(w)
+
+    def updateNameLabelFromPedsimAgent(self):
+        self.name_label.setText(self.pedsimAgentElement.pedsimAgent.name)
+
+    def updateEverythingFromPedsimAgentElement(self):
+        self.updateNameLabelFromPedsimAgent()
+        self.updateSpinBoxesFromGraphicsItem()
+        self.updateWaypointWidgets()
+
+
+
+class FlatlandObjectElement():
+    '''
+    A flatland object in the scene.
+    The graphics item holds position and rotation until they are saved into self.flatlandObject.
+    Widgets for editing (FlatlandObjectWidget) are only created while the element is selected in the elements list.
+    '''
+    def __init__(self, id: int, flatlandObjectIn: FlatlandObject, scenarioEditor):
+        self.id = id
+        self.scenarioEditor = scenarioEditor
+        self.graphicsScene = scenarioEditor.gscene
+        self.graphicsView = scenarioEditor.gview
+        self.flatlandObject = flatlandObjectIn
+        self.dirty = False  # True if position or rotation of the graphics item differ from self.flatlandObject
+        self.widget = None  # FlatlandObjectWidget, only exists while this element is selected in the elements list
+
+        # create graphics path item
+        self.graphicsPathItem = ArenaGraphicsPathItem(self)
+        ## add to scene
+        self.graphicsScene.addItem(self.graphicsPathItem)
+
+        self.updateEverythingFromFlatlandObject()
+
+    def getName(self) -> str:
+        return self.flatlandObject.name
+
+    def getDisplayName(self) -> str:
+        return f"{self.flatlandObject.name} (flatland object)"
+
+    def createWidget(self):
+        return FlatlandObjectWidget(self)
 
     def onBrowseClicked(self):
         default_folder = get_ros_package_path("simulator_setup")
         if default_folder != "":
             default_folder = os.path.join(default_folder, "obstacles")
-        res = QtWidgets.QFileDialog.getOpenFileName(self, "Select Flatland Model File", default_folder)
+        res = QtWidgets.QFileDialog.getOpenFileName(self.scenarioEditor, "Select Flatland Model File", default_folder)
         path = res[0]
         if os.path.exists(path):
-            # set label to show file name
-            name = pathlib.Path(path).parts[-1]
-            self.browse_button.setText(remove_file_ending(name))
             # update flatland object and graphics item
-            self.flatlandObject.flatlandModel.load(path)
+            self.flatlandObject.flatlandModel = load_flatland_model(path)
             self.updateGraphicsPathItemFromFlatlandObject()
+            if self.widget is not None:
+                self.widget.updateBrowseButtonFromFlatlandObject()
 
     def handleMouseDoubleClick(self):
         # function will be called by the graphics item
         self.onBrowseClicked()
 
     def handleItemChange(self):
-        # function will be called by the graphics item
-        self.updateSpinBoxesFromGraphicsItem()
+        # function will be called by the graphics item after it was moved or rotated
+        if self.widget is not None:
+            self.widget.updateSpinBoxesFromGraphicsItem()
+        self.markDirty()
 
-    def updateSpinBoxesFromGraphicsItem(self):
-        new_pos = self.graphicsPathItem.mapToScene(self.graphicsPathItem.transformOriginPoint())
-        self.posXSpinBox.setValue(new_pos.x())
-        self.posYSpinBox.setValue(new_pos.y())
+    def markDirty(self):
+        self.dirty = True
 
-    def updateGraphicsPathItemFromSpinBoxes(self):
+    def getCurrentPosition(self) -> QtCore.QPointF:
+        return self.graphicsPathItem.mapToScene(self.graphicsPathItem.transformOriginPoint())
+
+    def setPos(self, x: float, y: float):
+        # function will be called by the spin boxes of the widget
         if not self.graphicsPathItem.isDragged:  # prevents recursive loop (spin box <-> moving item)
-            x = self.posXSpinBox.value()
-            y = self.posYSpinBox.value()
             self.graphicsPathItem.setPosNoEvent(x, y)
             self.graphicsPathItem.updateTextItemPos()
+        self.markDirty()
 
     def updateGraphicsPathItemFromFlatlandObject(self):
         # update path
-        painter_path = QtGui.QPainterPath()
-        painter_path.setFillRule(QtCore.Qt.WindingFill)
-        # get shapes from the agent and convert them to a path
-        for body in self.flatlandObject.flatlandModel.bodies.values():
-            # skip safety distance circle
-            if body.name == "safety_dist_circle":
-                continue
-            # set color
-            brush = QtGui.QBrush(body.color, QtCore.Qt.BrushStyle.SolidPattern)
+        painter_path, brush = FLATLAND_MODEL_SHAPE_CACHE.get(self.flatlandObject.flatlandModel)
+        if brush is not None:
             self.graphicsPathItem.setBrush(brush)
-            # compose path
-            for footprint in body.footprints:
-                if isinstance(footprint, CircleFlatlandFootprint):
-                    center = QtCore.QPointF(footprint.center[0], footprint.center[1])
-                    radius = footprint.radius
-                    painter_path.addEllipse(center, radius, radius)
-                if isinstance(footprint, PolygonFlatlandFootprint):
-                    polygon = QtGui.QPolygonF([QtCore.QPointF(point[0], point[1]) for point in footprint.points])
-                    painter_path.addPolygon(polygon)
         self.graphicsPathItem.setPath(painter_path)
         # update rotation
         angle = rad_to_deg(self.flatlandObject.angle)
-        self.graphicsPathItem.setRotation(angle)
+        self.graphicsPathItem.setRotationNoEvent(angle)
         # update text
         self.graphicsPathItem.textItem.setPlainText(self.flatlandObject.name)
         self.graphicsPathItem.updateTextItemPos()
 
     def updateEverythingFromFlatlandObject(self):
         # position
-        self.posXSpinBox.setValue(self.flatlandObject.pos[0])
-        self.posYSpinBox.setValue(self.flatlandObject.pos[1])
-        # update name label
-        self.name_label.setText(self.flatlandObject.name)
-        # update browse button
-        if self.flatlandObject.flatlandModel.path == "":
-            self.browse_button.setText("Browse...")
-        else:
-            name = pathlib.Path(self.flatlandObject.flatlandModel.path).parts[-1]
-            self.browse_button.setText(remove_file_ending(name))
+        self.graphicsPathItem.setPosNoEvent(self.flatlandObject.pos[0], self.flatlandObject.pos[1])
         # update item scene
         self.updateGraphicsPathItemFromFlatlandObject()
+        # update widgets
+        if self.widget is not None:
+            self.widget.updateEverythingFromFlatlandObjectElement()
+        # graphics item now shows the values of the object
+        self.graphicsScene.flushCallsAfterBulkUpdate()
+        self.dirty = False
 
     def save(self):
         # saves everything to the flatland object
+        if not self.dirty:
+            return
 
         # name
         # can't be edited...
 
         # position
-        pos_x = self.posXSpinBox.value()
-        pos_y = self.posYSpinBox.value()
-        self.flatlandObject.pos = np.array([pos_x, pos_y])
+        pos = self.getCurrentPosition()
+        self.flatlandObject.pos = np.array([pos.x(), pos.y()])
         angle = self.graphicsPathItem.rotation()  # this is a value between -180 and 180
         self.flatlandObject.angle = deg_to_rad(angle)
+        self.dirty = False
 
         # model path
         # already updated in self.onBrowseClicked()
 
-    def remove(self):
+    def removeGraphicsItems(self):
         # remove items from scene
         self.graphicsScene.removeItem(self.graphicsPathItem)
         self.graphicsScene.removeItem(self.graphicsPathItem.textItem)
-        del self.graphicsPathItem.keyPressEater  # delete to remove event filter
-        # remove widget
-        self.parent().layout().removeWidget(self)
-        self.deleteLater()
+
+    def remove(self):
+        self.removeGraphicsItems()
+        # remove from elements list
+        self.scenarioEditor.removeElement(self)
 
     def onDeleteClicked(self):
         self.remove()
 
 
 
+class FlatlandObjectWidget(QtWidgets.QFrame):
+    '''
+    Widgets for editing the flatland object selected in the elements list.
+    '''
+    def __init__(self, flatlandObjectElement: FlatlandObjectElement, **kwargs):
+        super().__init__(**kwargs)
+        self.flatlandObjectElement = flatlandObjectElement
+        self.setup_ui()
+        self.updateEverythingFromFlatlandObjectElement()
+
+    def setup_ui(self):
+        self.setLayout(QtWidgets.QGridLayout())
+        self.setFrameStyle(QtWidgets.QFrame.Shape.Box | QtWidgets.QFrame.Shadow.Raised)
+
+        # name label
+        self.name_label = QtWidgets.QLabel("")
+        self.layout().addWidget(self.name_label, 0, 0)
+
+        # delete button
+        self.delete_button = QtWidgets.QPushButton("Delete")
+        self.delete_button.clicked.connect(self.flatlandObjectElement.onDeleteClicked)
+        self.layout().addWidget(self.delete_button, 0, 2)
+
+        # position
+        label = QtWidgets.QLabel("Pos:")
+        self.layout().addWidget(label, 1, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
+        self.posXSpinBox = ArenaQDoubleSpinBox()
+        self.posXSpinBox.valueChanged.connect(self.updateGraphicsPathItemFromSpinBoxes)
+        self.layout().addWidget(self.posXSpinBox, 1, 1)
+        self.posYSpinBox = ArenaQDoubleSpinBox()
+        self.posYSpinBox.valueChanged.connect(self.updateGraphicsPathItemFromSpinBoxes)
+        self.layout().addWidget(self.posYSpinBox, 1, 2)
+
+        # folder
+        folder_label = QtWidgets.QLabel("Model:")
+        self.layout().addWidget(folder_label, 2, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
+        self.browse_button = QtWidgets.QPushButton("Browse...")
+        self.browse_button.clicked.connect(self.flatlandObjectElement.onBrowseClicked)
+        self.layout().addWidget(self.browse_button, 2, 1, 1, -1)
+
+    def updateSpinBoxesFromGraphicsItem(self):
+        new_pos = self.flatlandObjectElement.getCurrentPosition()
+        # block signals to prevent recursion between spin boxes and graphics item
+        set_spin_box_values_no_signal([self.posXSpinBox, self.posYSpinBox], [new_pos.x(), new_pos.y()])
+
+    def updateGraphicsPathItemFromSpinBoxes(self):
+        self.flatlandObjectElement.setPos(self.posXSpinBox.value(), self.posYSpinBox.value())
+
+    def updateBrowseButtonFromFlatlandObject(self):
+        path = self.flatlandObjectElement.flatlandObject.flatlandModel.path
+        if path == "":
+            self.browse_button.setText("Browse...")
+        else:
+            # set label to show file name
+            name = pathlib.Path(path).parts[-1]
+            self.browse_button.setText(remove_file_ending(name))
+
+    def updateEverythingFromFlatlandObjectElement(self):
+        self.name_label.setText(self.flatlandObjectElement.flatlandObject.name)
+        self.updateSpinBoxesFromGraphicsItem()
+        self.updateBrowseButtonFromFlatlandObject()
+
+
+
 class RobotAgentWidget(QtWidgets.QFrame):
     '''
     This is a row in the obstacles frame.
@@ -617,26 +747,91 @@ class RobotAgentWidget(QtWidgets.QFrame):
 
 
 
+class ArenaScenarioElementsModel(QtCore.QAbstractListModel):
+    '''
+    List model of the pedsim agent and flatland object elements of the scenario editor.
+    Rows only show the name of an element, so a list view stays fast for thousands of elements.
+    '''
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.elements = []  # list of PedsimAgentElement and FlatlandObjectElement
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.elements)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.elements[index.row()].getDisplayName()
+        return None
+
+    def getElement(self, row: int):
+        return self.elements[row]
+
+    def getRow(self, element) -> int:
+        return self.elements.index(element)
+
+    def appendElement(self, element):
+        self.appendElements([element])
+
+    def appendElements(self, elements: list):
+        if len(elements) == 0:
+            return
+        row = len(self.elements)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + len(elements) - 1)
+        self.elements.extend(elements)
+        self.endInsertRows()
+
+    def removeElement(self, element):
+        row = self.getRow(element)
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self.elements[row]
+        self.endRemoveRows()
+
+    def updateElement(self, element):
+        index = self.index(self.getRow(element))
+        self.dataChanged.emit(index, index)
+
+    def updateAllElements(self):
+        if len(self.elements) > 0:
+            self.dataChanged.emit(self.index(0), self.index(len(self.elements) - 1))
+
+    def clear(self):
+        self.beginResetModel()
+        self.elements = []
+        self.endResetModel()
+
+
+
 class ArenaScenarioEditor(QtWidgets.QMainWindow):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.currentElement = None  # element whose widgets are shown below the elements list
+        # registries of all elements, kept in sync with the elements list
+        self.pedsimAgentElements = {}  # key: element id, value: PedsimAgentElement
+        self.flatlandObjectElements = {}  # key: element id, value: FlatlandObjectElement
+        self.elementsByName = {}  # key: name of agent or object, value: element
+        self.elementNames = {}  # key: element id, value: name the element is registered with in self.elementsByName
+        self.addWaypointModeElements = {}  # key: element id, value: PedsimAgentElement whose add waypoint mode is active
+        self.pendingElements = None  # elements added during bulkUpdate(), appended to the elements list at its end
         self.setup_ui()
         self.arenaScenario = ArenaScenario()
         self.numObstacles = 0
-        self.pixmap_item = None
+        self.map_item = None
         self.mapData = None
         self.currentSavePath = ""
         self.copied = []
         self.lastNameId = 0
+        self.pedsimAgentEditor = None  # shared by all pedsim agent elements, created when first needed
 
         # set default map to empty map if it exists
         path = pathlib.Path(get_ros_package_path("simulator_setup")) / "maps" / "map_empty" / "map.yaml"
         if path.is_file():
             self.setMap(str(path))
 
-        # create global pedsim settings widget
-        self.pedsimAgentsGlobalConfigWidget = PedsimAgentEditorGlobalConfig()
-        self.pedsimAgentsGlobalConfigWidget.editorSaved.connect(self.onPedsimAgentsGlobalConfigChanged)
+        # global pedsim settings widget, created when first opened
+        self.pedsimAgentsGlobalConfigWidget = None
 
     def setup_ui(self):
         self.setWindowTitle("Flatland Scenario Editor")
@@ -678,41 +873,77 @@ class ArenaScenarioEditor(QtWidgets.QMainWindow):
         ## graphicsview
         self.gview = ArenaQGraphicsView(self.gscene)
         self.gview.scale(0.25, 0.25)  # zoom out a bit
+        # only forwarded to the agents in add waypoint mode, so a click doesn't call every element
+        self.gview.clickedPos.connect(self.handleGraphicsViewClick)
         drawing_frame.layout().addWidget(self.gview)
 
+        # selectionChanged is emitted for every item that is (un)selected, only handle the selection once they are done
+        self.sceneSelectionTimer = QtCore.QTimer(self)
+        self.sceneSelectionTimer.setSingleShot(True)
+        self.sceneSelectionTimer.timeout.connect(self.onSceneSelectionChanged)
+        self.gscene.selectionChanged.connect(self.sceneSelectionTimer.start)
+
         # obstacles
-        ## scrollarea
-        self.obstacles_scrollarea = QtWidgets.QScrollArea(self)
-        self.obstacles_scrollarea.setWidgetResizable(True)
-        self.obstacles_scrollarea.setMinimumWidth(300)
-        self.centralWidget().layout().addWidget(self.obstacles_scrollarea, 0, 0, -1, 1)
         ## frame
         self.obstacles_frame = QtWidgets.QFrame()
         self.obstacles_frame.setLayout(QtWidgets.QVBoxLayout())
-        self.obstacles_frame.setSizePolicy(QtWidgets.QSizePolicy.Policy.Maximum, QtWidgets.QSizePolicy.Policy.Maximum)
-        self.obstacles_scrollarea.setWidget(self.obstacles_frame)
+        self.obstacles_frame.setMinimumWidth(300)
+        self.centralWidget().layout().addWidget(self.obstacles_frame, 0, 0, -1, 1)
 
         # always add robot agent
         self.robotAgentWidget = RobotAgentWidget(self.gscene, self.gview)
         self.obstacles_frame.layout().addWidget(self.robotAgentWidget)
 
+        ## list of all pedsim agents and flatland objects
+        self.elementsModel = ArenaScenarioElementsModel()
+        self.elementsListView = QtWidgets.QListView()
+        self.elementsListView.setUniformItemSizes(True)  # rows don't need to be measured one by one
+        self.elementsListView.setModel(self.elementsModel)
+        self.elementsListView.selectionModel().currentChanged.connect(self.onCurrentElementChanged)
+        self.obstacles_frame.layout().addWidget(self.elementsListView, 1)
+
+        ## scrollarea for the widgets of the selected element
+        self.elementScrollArea = QtWidgets.QScrollArea()
+        self.elementScrollArea.setWidgetResizable(True)
+        self.obstacles_frame.layout().addWidget(self.elementScrollArea, 1)
+
     def onPedsimAgentsGlobalConfigClicked(self):
+        if self.pedsimAgentsGlobalConfigWidget is None:
+            self.pedsimAgentsGlobalConfigWidget = PedsimAgentEditorGlobalConfig()
+            self.pedsimAgentsGlobalConfigWidget.editorSaved.connect(self.onPedsimAgentsGlobalConfigChanged)
         self.pedsimAgentsGlobalConfigWidget.show()
 
     def onPedsimAgentsGlobalConfigChanged(self):
-        for w in self.getPedsimAgentWidgets():
-            w.save()
-            global_agent = copy.deepcopy(self.pedsimAgentsGlobalConfigWidget.pedsimAgent)
-            # preserve individual values
-            global_agent.name = w.pedsimAgent.name
-            global_agent.flatlandModel = w.pedsimAgent.flatlandModel
-            global_agent.pos = w.pedsimAgent.pos
-            global_agent.waypoints = w.pedsimAgent.waypoints
-            # set new agent
-            w.pedsimAgent = global_agent
-            w.pedsimAgentEditor.pedsimAgent = global_agent
-            w.pedsimAgentEditor.updateValuesFromPedsimAgent()
-            w.handleEditorSaved()
+        with self.bulkUpdate():
+            for e in self.getPedsimAgentElements():
+                e.save()
+                global_agent = copy.deepcopy(self.pedsimAgentsGlobalConfigWidget.pedsimAgent)
+                # preserve individual values
+                global_agent.name = e.pedsimAgent.name
+                global_agent.flatlandModel = e.pedsimAgent.flatlandModel
+                global_agent.pos = e.pedsimAgent.pos
+                global_agent.waypoints = e.pedsimAgent.waypoints
+                # set new agent
+                e.pedsimAgent = global_agent
+                e.handleEditorSaved()
+
+    def getPedsimAgentEditor(self) -> PedsimAgentEditor:
+        if self.pedsimAgentEditor is None:
+            self.pedsimAgentEditor = PedsimAgentEditor(parent=self, flags=QtCore.Qt.WindowType.Window)
+            self.pedsimAgentEditor.editorSaved.connect(self.onPedsimAgentEditorSaved)
+        return self.pedsimAgentEditor
+
+    def editPedsimAgent(self, element: PedsimAgentElement):
+        '''
+        Show the pedsim agent editor for the agent of element.
+        '''
+        editor = self.getPedsimAgentEditor()
+        editor.setPedsimAgentElement(element)
+        editor.show()
+
+    def onPedsimAgentEditorSaved(self):
+        if self.pedsimAgentEditor.pedsimAgentElement is not None:
+            self.pedsimAgentEditor.pedsimAgentElement.handleEditorSaved()
 
     def onSetMapClicked(self):
         initial_folder = os.path.join(get_ros_package_path("simulator_setup"), "maps")
@@ -723,28 +954,30 @@ class ArenaScenarioEditor(QtWidgets.QMainWindow):
 
     def setMap(self, path: str):
         self.mapData = RosMapData(path)
-        pixmap = QtGui.QPixmap(self.mapData.image_path)
-        transform = QtGui.QTransform.fromScale(1.0, -1.0)  # flip y axis
-        pixmap = pixmap.transformed(transform)
-        if self.pixmap_item != None:
-            # remove old map
-            self.gscene.removeItem(self.pixmap_item)
-        self.pixmap_item = QtWidgets.QGraphicsPixmapItem(pixmap)
-        self.pixmap_item.setZValue(-1.0)  # make sure map is always in the background
-        self.pixmap_item.setScale(self.mapData.resolution)
-        self.pixmap_item.setOffset(self.mapData.origin[0] / self.mapData.resolution, self.mapData.origin[1] / self.mapData.resolution)
-        self.gscene.addItem(self.pixmap_item)
+        self.map_item = replace_map_item(self.gscene, self.map_item, self.mapData)
 
     def getMapData(self, path: str) -> dict:
         # read yaml file containing map meta data
         with open(path, "r") as file:
-            data = yaml.safe_load(file)
+            data = load_yaml(file)
             return data
 
     def disableAddWaypointMode(self):
-        widgets = self.getPedsimAgentWidgets()
-        for w in widgets:
-            w.setAddWaypointMode(False)
+        for e in list(self.addWaypointModeElements.values()):
+            e.setAddWaypointMode(False)
+
+    def updateAddWaypointMode(self, element: PedsimAgentElement):
+        '''
+        Register or unregister element for clicks on the scene, depending on whether its add waypoint mode is active.
+        '''
+        if element.addWaypointModeActive:
+            self.addWaypointModeElements[element.id] = element
+        else:
+            self.addWaypointModeElements.pop(element.id, None)
+
+    def handleGraphicsViewClick(self, pos: QtCore.QPointF):
+        for e in list(self.addWaypointModeElements.values()):
+            e.addWaypoint(pos)
 
     def onAddPedsimAgentClicked(self):
         yaml_file = ""
@@ -755,17 +988,19 @@ class ArenaScenarioEditor(QtWidgets.QMainWindow):
 
         new_agent = PedsimAgent(self.generateName(), yaml_file)
         self.arenaScenario.pedsimAgents.append(new_agent)
-        self.addPedsimAgentWidget(new_agent)
+        self.addPedsimAgentElement(new_agent)
 
-    def addPedsimAgentWidget(self, agent: PedsimAgent) -> PedsimAgentWidget:
+    def addPedsimAgentElement(self, agent: PedsimAgent) -> PedsimAgentElement:
         '''
-        Adds a new pedsim agent widget with the given agent.
+        Adds a new pedsim agent element with the given agent to the scene and the elements list.
         Warning: self.arenaScenario is not updated. Management of self.arenaScenario happens outside of this function.
         '''
-        w = PedsimAgentWidget(self.numObstacles, agent, self.gscene, self.gview, parent=self)
-        self.obstacles_frame.layout().addWidget(w)
+        e = PedsimAgentElement(self.numObstacles, agent, self)
+        self.pedsimAgentElements[e.id] = e
+        self.registerElementName(e)
+        self.appendElementToList(e)
         self.numObstacles += 1
-        return w
+        return e
 
     def onAddFlatlandObjectClicked(self):
         model_path = ""
@@ -776,46 +1011,150 @@ class ArenaScenarioEditor(QtWidgets.QMainWindow):
 
         new_object = FlatlandObject(self.generateName(), model_path)
         self.arenaScenario.staticObstacles.append(new_object)
-        self.addFlatlandObjectWidget(new_object)
+        self.addFlatlandObjectElement(new_object)
 
-    def addFlatlandObjectWidget(self, object: FlatlandObject) -> FlatlandObjectWidget:
+    def addFlatlandObjectElement(self, object: FlatlandObject) -> FlatlandObjectElement:
         '''
-        Adds a new flatland object widget with the given agent.
+        Adds a new flatland object element with the given object to the scene and the elements list.
         Warning: self.arenaScenario is not updated. Management of self.arenaScenario happens outside of this function.
         '''
-        w = FlatlandObjectWidget(self.numObstacles, object, self.gscene, self.gview)
-        self.obstacles_frame.layout().addWidget(w)
+        e = FlatlandObjectElement(self.numObstacles, object, self)
+        self.flatlandObjectElements[e.id] = e
+        self.registerElementName(e)
+        self.appendElementToList(e)
         self.numObstacles += 1
-        return w
+        return e
 
-    def getFlatlandObjectWidgets(self) -> List[FlatlandObjectWidget]:
-        widgets = []
-        for i in range(self.obstacles_frame.layout().count()):
-            w = self.obstacles_frame.layout().itemAt(i).widget()
-            if w != None and isinstance(w, FlatlandObjectWidget):
-                widgets.append(w)
-        return widgets
+    def appendElementToList(self, element):
+        if self.pendingElements is not None:
+            self.pendingElements.append(element)
+        else:
+            self.elementsModel.appendElement(element)
 
-    def getPedsimAgentWidgets(self):
-        widgets = []
-        for i in range(self.obstacles_frame.layout().count()):
-            w = self.obstacles_frame.layout().itemAt(i).widget()
-            if w != None and isinstance(w, PedsimAgentWidget):
-                widgets.append(w)
-        return widgets
+    def removeElement(self, element):
+        '''
+        Remove element from the elements list. Called by the element after it removed its graphics items.
+        '''
+        if element is self.currentElement:
+            # don't let the list select and show the next element instead
+            self.elementsListView.setCurrentIndex(QtCore.QModelIndex())
+            self.showElementWidget(None)
+        self.pedsimAgentElements.pop(element.id, None)
+        self.flatlandObjectElements.pop(element.id, None)
+        self.unregisterElementName(element)
+        if self.pendingElements is not None and element in self.pendingElements:
+            self.pendingElements.remove(element)
+        else:
+            self.elementsModel.removeElement(element)
+
+    @contextlib.contextmanager
+    def bulkUpdate(self):
+        '''
+        Add, change or remove many elements at once.
+        The scene is updated and repainted once at the end (see ArenaQGraphicsScene.bulkUpdate()),
+        new elements are inserted into the elements list together.
+        '''
+        if self.pendingElements is not None:
+            # nested, everything is done by the outermost bulkUpdate()
+            yield
+            return
+        self.pendingElements = []
+        try:
+            with self.gscene.bulkUpdate():
+                yield
+        finally:
+            elements = self.pendingElements
+            self.pendingElements = None
+            self.elementsModel.appendElements(elements)
+            self.elementsModel.updateAllElements()
+
+    def removeAllElements(self):
+        '''
+        Remove all pedsim agent and flatland object elements at once.
+        '''
+        self.elementsListView.setCurrentIndex(QtCore.QModelIndex())
+        self.showElementWidget(None)
+        for e in self.elementsModel.elements:
+            e.removeGraphicsItems()
+        self.pedsimAgentElements = {}
+        self.flatlandObjectElements = {}
+        self.elementsByName = {}
+        self.elementNames = {}
+        self.elementsModel.clear()
+
+    def registerElementName(self, element):
+        name = element.getName()
+        self.elementsByName[name] = element
+        self.elementNames[element.id] = name
+
+    def unregisterElementName(self, element):
+        name = self.elementNames.pop(element.id, None)
+        # names of loaded scenarios are not necessarily unique
+        if self.elementsByName.get(name) is element:
+            del self.elementsByName[name]
+
+    def updateElementInList(self, element):
+        # name might have changed
+        self.unregisterElementName(element)
+        self.registerElementName(element)
+        if self.pendingElements is None:
+            self.elementsModel.updateElement(element)
+        # otherwise all rows are updated at the end of bulkUpdate()
+
+    def getElementByName(self, name: str):
+        return self.elementsByName.get(name)
+
+    def getFlatlandObjectElements(self) -> List[FlatlandObjectElement]:
+        return list(self.flatlandObjectElements.values())
+
+    def getPedsimAgentElements(self) -> List[PedsimAgentElement]:
+        return list(self.pedsimAgentElements.values())
 
     def getElementsCount(self):
-        count = 0
-        for i in range(self.obstacles_frame.layout().count()):
-            w = self.obstacles_frame.layout().itemAt(i).widget()
-            if w != None and isinstance(w, PedsimAgentWidget):
-                count += 1
-            if w != None and isinstance(w, FlatlandObjectWidget):
-                count += 1
-        return count
+        return len(self.pedsimAgentElements) + len(self.flatlandObjectElements)
+
+    def showElementWidget(self, element):
+        '''
+        Show the widgets for editing element below the elements list. Only one element has widgets at a time.
+        '''
+        widget = self.elementScrollArea.takeWidget()
+        if widget is not None:
+            widget.deleteLater()
+        if self.currentElement is not None:
+            self.currentElement.widget = None
+        self.currentElement = element
+        if element is not None:
+            element.widget = element.createWidget()
+            self.elementScrollArea.setWidget(element.widget)
+
+    def onCurrentElementChanged(self, current: QtCore.QModelIndex, previous: QtCore.QModelIndex):
+        if not current.isValid():
+            self.showElementWidget(None)
+            return
+        element = self.elementsModel.getElement(current.row())
+        if element is self.currentElement:
+            return
+        self.showElementWidget(element)
+        # select element in the scene
+        self.gscene.clearSelection()
+        element.graphicsPathItem.setSelected(True)
+        self.gview.ensureVisible(element.graphicsPathItem)
+
+    def onSceneSelectionChanged(self):
+        # show the widgets of an element when it is the only item selected in the scene
+        items = self.gscene.selectedItems()
+        if len(items) != 1 or not hasattr(items[0], "element"):
+            return
+        element = items[0].element
+        if element is not self.currentElement:
+            self.showElementWidget(element)
+            self.elementsListView.setCurrentIndex(self.elementsModel.index(self.elementsModel.getRow(element)))
 
     def generateName(self):
         self.lastNameId += 1
+        # skip names of loaded agents and objects
+        while str(self.lastNameId) in self.elementsByName:
+            self.lastNameId += 1
         return str(self.lastNameId)
 
     def keyPressEvent(self, event: QtGui.QKeyEvent):
@@ -836,45 +1175,46 @@ class ArenaScenarioEditor(QtWidgets.QMainWindow):
     def toggleWaypointMode(self):
         # active waypoint mode for selected pedsim agents
         for item in self.gscene.selectedItems():
-            if hasattr(item, "parentWidget"):
-                widget = item.parentWidget
-                if isinstance(widget, PedsimAgentWidget):
-                    widget.onAddWaypointClicked()
+            if hasattr(item, "element"):
+                element = item.element
+                if isinstance(element, PedsimAgentElement):
+                    element.onAddWaypointClicked()
 
     def pasteElements(self):
         # duplicate copied items
-        for item in self.copied:
-            widget = item.parentWidget
-            if isinstance(widget, PedsimAgentWidget):
-                widget.save()
-                agent = copy.deepcopy(widget.pedsimAgent)
-                agent.name = self.generateName()
-                # move agent and waypoints a bit
-                agent.pos[0] += 1.0
-                agent.pos[1] += 1.0
-                for wp in agent.waypoints:
-                    wp[0] += 1.0
-                    wp[1] += 1.0
-                new_widget = self.addPedsimAgentWidget(agent)
-                # select new item and waypoints
-                new_widget.graphicsPathItem.setSelected(True)
-                for w in new_widget.getWaypointWidgets():
-                    w.ellipseItem.setSelected(True)
-                # unselect old item and waypoints
-                widget.graphicsPathItem.setSelected(False)
-                for w in widget.getWaypointWidgets():
-                    w.ellipseItem.setSelected(False)
-            elif isinstance(widget, FlatlandObjectWidget):
-                widget.save()
-                obj = copy.deepcopy(widget.flatlandObject)
-                obj.name = self.generateName()
-                obj.pos[0] += 1.0
-                obj.pos[1] += 1.0
-                new_widget = self.addFlatlandObjectWidget(obj)
-                # select new item
-                new_widget.graphicsPathItem.setSelected(True)
-                # unselect old item
-                widget.graphicsPathItem.setSelected(False)
+        with self.bulkUpdate():
+            for item in self.copied:
+                element = getattr(item, "element", None)
+                if isinstance(element, PedsimAgentElement):
+                    element.save()
+                    agent = copy.deepcopy(element.pedsimAgent)
+                    agent.name = self.generateName()
+                    # move agent and waypoints a bit
+                    agent.pos[0] += 1.0
+                    agent.pos[1] += 1.0
+                    for wp in agent.waypoints:
+                        wp[0] += 1.0
+                        wp[1] += 1.0
+                    new_element = self.addPedsimAgentElement(agent)
+                    # select new item and waypoints
+                    new_element.graphicsPathItem.setSelected(True)
+                    for waypoint_item in new_element.getWaypointItems():
+                        waypoint_item.setSelected(True)
+                    # unselect old item and waypoints
+                    element.graphicsPathItem.setSelected(False)
+                    for waypoint_item in element.getWaypointItems():
+                        waypoint_item.setSelected(False)
+                elif isinstance(element, FlatlandObjectElement):
+                    element.save()
+                    obj = copy.deepcopy(element.flatlandObject)
+                    obj.name = self.generateName()
+                    obj.pos[0] += 1.0
+                    obj.pos[1] += 1.0
+                    new_element = self.addFlatlandObjectElement(obj)
+                    # select new item
+                    new_element.graphicsPathItem.setSelected(True)
+                    # unselect old item
+                    element.graphicsPathItem.setSelected(False)
 
     def onNewScenarioClicked(self):
         pass
@@ -919,21 +1259,17 @@ class ArenaScenarioEditor(QtWidgets.QMainWindow):
         return False
 
     def updateWidgetsFromArenaScenario(self):
-        # pedsim agents
-        ## remove all pedsim widgets
-        for w in self.getPedsimAgentWidgets():
-            w.remove()
-        ## create new pedsim widgets
-        for agent in self.arenaScenario.pedsimAgents:
-            self.addPedsimAgentWidget(agent)
-
-        # static obstacles
-        ## remove all flatland object widgets
-        for w in self.getFlatlandObjectWidgets():
-            w.remove()
-        ## create new flatland object widgets
-        for obstacle in self.arenaScenario.staticObstacles:
-            self.addFlatlandObjectWidget(obstacle)
+        with self.bulkUpdate():
+            # remove all pedsim agent and flatland object elements
+            self.removeAllElements()
+
+            # pedsim agents
+            for agent in self.arenaScenario.pedsimAgents:
+                self.addPedsimAgentElement(agent)
+
+            # static obstacles
+            for obstacle in self.arenaScenario.staticObstacles:
+                self.addFlatlandObjectElement(obstacle)
 
         # interactive obstacles
         # TODO
@@ -953,23 +1289,24 @@ class ArenaScenarioEditor(QtWidgets.QMainWindow):
 
     def updateArenaScenarioFromWidgets(self):
         '''
-        Save data from widgets into self.arenaScenario.
+        Save data from elements and widgets into self.arenaScenario.
+        Elements only write their values if they were changed since the last save.
         '''
-        # reset scenario
-        self.arenaScenario.__init__()
-
         # save path
         self.arenaScenario.path = self.currentSavePath
 
         # save pedsim agents
-        for w in self.getPedsimAgentWidgets():
-            w.save()  # save all data from widget(s) into pedsim agent
-            self.arenaScenario.pedsimAgents.append(w.pedsimAgent)  # add pedsim agent
+        pedsim_agent_elements = self.getPedsimAgentElements()
+        for e in pedsim_agent_elements:
+            e.save()  # save changed data from graphics items into pedsim agent
+        self.arenaScenario.pedsimAgents = [e.pedsimAgent for e in pedsim_agent_elements]
+        self.arenaScenario.pedsimAgentTable = None
 
         # save static obstacles
-        for w in self.getFlatlandObjectWidgets():
-            w.save()  # save all data from widget(s) into flatland object
-            self.arenaScenario.staticObstacles.append(w.flatlandObject)  # add flatland object
+        flatland_object_elements = self.getFlatlandObjectElements()
+        for e in flatland_object_elements:
+            e.save()  # save changed data from graphics item into flatland object
+        self.arenaScenario.staticObstacles = [e.flatlandObject for e in flatland_object_elements]
 
         # save map path
         if self.mapData != None:
@@ -3,6 +3,7 @@ from PyQt5 import QtGui, QtCore, QtWidgets
 from enum import Enum
 import yaml
 import os
+import copy
 import numpy as np
 
 class B2BodyType(Enum):
@@ -170,6 +171,17 @@ class FlatlandModel():
         self.bodies = {}  # key: body id (int), value: body (FlatlandBody)
         self.path = ""  # path to file associated with this model
         self.bodies_index = 0
+        self.shared = False  # shared models are handed out by FlatlandModelCache and must not be modified
+
+    def __deepcopy__(self, memo):
+        if self.shared:
+            # shared models are immutable, so copies can reference the same object
+            return self
+        model = FlatlandModel()
+        memo[id(self)] = model
+        for key, value in self.__dict__.items():
+            setattr(model, key, copy.deepcopy(value, memo))
+        return model
 
     def __eq__(self, other):
         if not isinstance(other, FlatlandModel):
@@ -196,40 +208,92 @@ class FlatlandModel():
 
         with open(self.path, "w") as file:
             data = self.toDict()
-            yaml.dump(data, file, default_flow_style=None)
+            dump_yaml(data, file, default_flow_style=None)
 
         print("saved model to", self.path)
         return True
 
     def load(self, path: str):
+        if self.shared:
+            raise Exception("shared flatland models can't be modified. Use load_flatland_model() to get another model.")
         if os.path.exists(path):
             self.bodies = {}
             with open(path, "r") as file:
-                data = yaml.safe_load(file)
+                data = load_yaml(file)
                 for body in data["bodies"]:
                     flatland_body = FlatlandBody.fromDict(body)
                     self.bodies[self.bodies_index] = flatland_body
                     self.bodies_index += 1
             self.path = path
 
+class FlatlandModelCache():
+    '''
+    Process wide cache of parsed model files, so that e.g. hundreds of agents using the same model
+    only parse the model file once.
+    Models are keyed by their resolved path and the modification time of the file, a changed file will be parsed again.
+    All models handed out are shared between their users and must not be modified.
+    '''
+    def __init__(self):
+        self.models = {}  # key: resolved path (str), value: (mtime_ns (int), model (FlatlandModel))
+
+    def get(self, path: str) -> FlatlandModel:
+        '''
+        Return the shared model for the file at path. Returns an empty unshared model if the file doesn't exist.
+        '''
+        try:
+            resolved_path = os.path.realpath(path)
+            mtime = os.stat(resolved_path).st_mtime_ns
+        except (OSError, ValueError):
+            return FlatlandModel()
+
+        if resolved_path in self.models:
+            cached_mtime, model = self.models[resolved_path]
+            if cached_mtime == mtime:
+                return model
+
+        model = FlatlandModel()
+        model.load(path)
+        model.shared = True
+        self.models[resolved_path] = (mtime, model)
+        return model
+
+    def clear(self):
+        self.models = {}
+
+
+FLATLAND_MODEL_CACHE = FlatlandModelCache()
+
+
+def load_flatland_model(path: str) -> FlatlandModel:
+    '''
+    Return the shared and immutable model for the file at path from the process wide model cache.
+    Create a new FlatlandModel and load() it instead if the model should be edited.
+    '''
+    return FLATLAND_MODEL_CACHE.get(path)
+
+
 class FlatlandObject():
     def __init__(self, name: str = "", model_path: str = ""):
         self.name = name
         self.flatlandModel = FlatlandModel()
         if os.path.exists(model_path):
-            self.flatlandModel.load(model_path)
+            self.flatlandModel = load_flatland_model(model_path)
         self.pos = np.zeros(2)
         self.angle = 0.0
 
     @staticmethod
-    def fromDict(d : dict):
+    def fromDict(d : dict, convert_paths: bool = True):
         o = FlatlandObject()
-        o.loadFromDict(d)
+        o.loadFromDict(d, convert_paths)
         return o
 
-    def loadFromDict(self, d: dict):
+    def loadFromDict(self, d: dict, convert_paths: bool = True):
+        '''
+        - convert_paths: convert the model path to the current user (see get_current_user_path())
+        '''
         self.name = d["name"]
-        self.flatlandModel.load(get_current_user_path(d["model_path"]))
+        model_path = get_current_user_path(d["model_path"]) if convert_paths else d["model_path"]
+        self.flatlandModel = load_flatland_model(model_path)
         self.pos = np.array([float(val) for val in d["pos"]])
         self.angle = float(d["angle"])
 
@@ -70,12 +70,15 @@ def get_current_user_path(path_in: str) -> str:
     """
     Convert a path from another user to the current user, for example:
     "/home/alice/catkin_ws" -> "/home/bob/catkin_ws"
+    Paths that are not inside a home folder (e.g. relative paths or paths in /root or /opt) are returned unchanged.
     """
     if path_in == "":
         return ""
     from pathlib import Path
 
     path = Path(path_in)
+    if len(path.parts) < 3 or path.parts[0] != path.anchor or path.parts[1] != "home":
+        return path_in
     new_path = Path.home().joinpath(*path.parts[3:])
     return str(new_path)
 
@@ -86,4 +89,46 @@ def remove_file_ending(file_name: str) -> str:
     file_ending_index = file_name.find(".")
     if file_ending_index != -1:
         return file_name[:file_ending_index]
-    return file_name
\ No newline at end of file
+    return file_name
+
+def load_yaml(file):
+    """
+    Read YAML data from an open file or a string.
+    Uses the C implementation of the safe loader (libyaml) if PyYAML was built with it.
+    """
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(file, Loader=loader)
+
+def dump_yaml(data, file=None, **kwargs):
+    """
+    Write data as YAML to an open file, or return it as a string if no file is given.
+    Same output as yaml.dump(), but uses the C implementation of the dumper (libyaml) if PyYAML was built with it.
+    """
+    import yaml
+    dumper = getattr(yaml, "CDumper", yaml.Dumper)
+    return yaml.dump(data, file, Dumper=dumper, **kwargs)
+
+def load_json(file):
+    """
+    Read JSON data from an open file. Uses orjson if it is installed.
+    Documents orjson rejects (e.g. containing NaN or Infinity, which json.dump() writes) are read with json instead.
+    """
+    import json
+    text = file.read()
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(text)
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+def dump_json(data, file, indent: int = 4):
+    """
+    Write data as JSON to an open text file, with the same output as json.dump(data, file, indent=indent).
+    The whole document is encoded first and then written at once, which is a lot faster than json.dump().
+    """
+    import json
+    file.write(json.dumps(data, indent=indent))
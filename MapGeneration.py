@@ -0,0 +1,738 @@
+"""
+Headless generation of random ROS maps.
+This module only depends on NumPy, Pillow and PyYAML so maps can be generated on machines without a display.
+The MapGenerator GUI is a client of this module.
+
+Run it from the command line to generate maps in bulk, for example:
+    python MapGeneration.py /path/to/maps --number 10000 --type indoor --width 200 --height 200
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import pathlib
+import re
+import sys
+import time
+from enum import Enum
+from typing import Callable, Dict, List
+
+import numpy as np
+import yaml
+from PIL import Image
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows, the maps folder index is not locked there
+    fcntl = None
+
+
+class MapType(Enum):
+    INDOOR = 0
+    OUTDOOR = 1
+
+
+class ObstacleShape(Enum):
+    SQUARE = 0
+    CIRCLE = 1
+    RECTANGLE = 2
+
+
+class ImageFormat(Enum):
+    PNG = 0  # 8 bit grayscale PNG
+    PNG1 = 1  # 1 bit PNG, smallest files. Not every loader expands 1 bit images correctly (e.g. ROS map_server)
+    PGM = 2  # uncompressed binary PGM, fastest to write
+
+
+# file endings of the image formats
+IMAGE_FILE_ENDINGS = {
+    ImageFormat.PNG: ".png",
+    ImageFormat.PNG1: ".png",
+    ImageFormat.PGM: ".pgm",
+}
+
+# zlib compression level used for PNG files with the "fast" setting
+FAST_COMPRESS_LEVEL = 1
+
+
+class MapGenerationParameters:
+    '''
+    All settings needed to generate a map.
+    '''
+    def __init__(self):
+        self.map_type = MapType.INDOOR
+        self.height = 101
+        self.width = 101
+        # indoor
+        self.corridor_radius = 3
+        self.iterations = 100
+        # outdoor
+        self.obstacle_number = 20
+        self.obstacle_extra_radius = 2
+        self.obstacle_shape = ObstacleShape.SQUARE
+        # map.yaml
+        self.resolution = 0.5
+        # image file
+        self.image_format = ImageFormat.PNG
+        self.compress_level = 6  # 0 (no compression) - 9 (best compression), only used for PNG files
+
+    def toDict(self):
+        d = {}
+        d["type"] = self.map_type.name.lower()
+        d["height"] = self.height
+        d["width"] = self.width
+        if self.map_type == MapType.INDOOR:
+            d["corridor_radius"] = self.corridor_radius
+            d["iterations"] = self.iterations
+        elif self.map_type == MapType.OUTDOOR:
+            d["obstacle_number"] = self.obstacle_number
+            d["obstacle_extra_radius"] = self.obstacle_extra_radius
+            d["obstacle_shape"] = self.obstacle_shape.name.lower()
+        d["resolution"] = self.resolution
+        d["image_format"] = self.image_format.name.lower()
+        if self.image_format in [ImageFormat.PNG, ImageFormat.PNG1]:
+            d["compress_level"] = self.compress_level
+        return d
+
+
+class MapFileStats:
+    '''
+    Size of and time needed for writing the image file of a map.
+    '''
+    def __init__(self, map_name: str = "", bytes_written: int = 0, write_time: float = 0.0, checksum: str = ""):
+        self.map_name = map_name
+        self.bytes_written = bytes_written
+        self.write_time = write_time  # in seconds
+        self.checksum = checksum  # sha1 of the occupancy grid
+
+    def getThroughput(self) -> float:
+        '''
+        Return write throughput in bytes per second.
+        '''
+        return self.bytes_written / self.write_time if self.write_time > 0 else 0.0
+
+
+def get_map_names(maps_folder_path: pathlib.Path, number_of_maps: int) -> List[str]:
+    '''
+    Generate simple map names that don't exist yet in the form of f"map{index}".
+    Search the maps folder for already existing maps in this format. Get the highest index and then
+    start counting from there.
+    '''
+    folder = pathlib.Path(maps_folder_path)
+    map_folders = [p for p in folder.iterdir() if p.is_dir()]
+    names = [p.parts[-1] for p in map_folders]
+    # get only the names that are in the form of f"map{index}"
+    prefix = "map"
+    pat = re.compile(f"{prefix}\\d+$", flags=re.ASCII)
+    filtered_names = [name for name in names if pat.match(name) != None]
+    # get the max index that already exists
+    max_index = 0
+    if len(filtered_names) > 0:
+        max_index = max([int(name[len(prefix):])
+                        for name in filtered_names])
+    # generate new names beginning with the max index
+    return [f"map{i}" for i in range(max_index+1, max_index+1+number_of_maps)]
+
+
+class MapFolderIndex:
+    '''
+    Persistent index of a maps folder, kept in two files inside the folder:
+    - .map_index.json holds the next free map index, so new map names can be reserved without listing the whole folder
+    - .map_index.jsonl gets one line per generation run with the parameters of the run and
+      the seed, image and checksum of every map it wrote. Lines are only appended, never rewritten.
+    Several generators (processes or machines sharing the folder) can use the same index,
+    all writes happen while holding a lock on .map_index.lock.
+    '''
+    INDEX_FILE_NAME = ".map_index.json"
+    MAPS_FILE_NAME = ".map_index.jsonl"
+    LOCK_FILE_NAME = ".map_index.lock"
+    VERSION = 2
+
+    def __init__(self, maps_folder_path: pathlib.Path):
+        self.folder = pathlib.Path(maps_folder_path)
+        self.index_path = self.folder / self.INDEX_FILE_NAME
+        self.maps_path = self.folder / self.MAPS_FILE_NAME
+        self.lock_path = self.folder / self.LOCK_FILE_NAME
+
+    @contextlib.contextmanager
+    def lock(self):
+        with open(str(self.lock_path), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.lockf(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(lock_file, fcntl.LOCK_UN)
+
+    def load_next_index(self) -> int:
+        '''
+        Read the next free map index from disk. If there is no index yet, the folder is scanned once for existing maps.
+        Should be called while holding the lock.
+        '''
+        if self.index_path.exists():
+            with open(str(self.index_path), "r") as file:
+                return json.load(file)["next_index"]
+        return self.scan_next_index()
+
+    def save_next_index(self, next_index: int):
+        '''
+        Replace the index file atomically so readers never see a partially written index.
+        Should be called while holding the lock.
+        '''
+        temp_path = self.index_path.with_name(f"{self.INDEX_FILE_NAME}.{os.getpid()}.tmp")
+        with open(str(temp_path), "w") as file:
+            json.dump({"version": self.VERSION, "next_index": next_index}, file, separators=(",", ":"))
+        os.replace(str(temp_path), str(self.index_path))
+
+    def scan_next_index(self) -> int:
+        names = get_map_names(self.folder, 1)
+        return int(names[0][len("map"):])
+
+    def reserve(self, number_of_maps: int) -> List[str]:
+        '''
+        Reserve number_of_maps map names. Names are never handed out twice, even if the maps are never written.
+        Names of folders that already exist are skipped, so the names are not necessarily consecutive.
+        '''
+        map_names = []
+        with self.lock():
+            index = self.load_next_index()
+            while len(map_names) < number_of_maps:
+                # someone might have created maps in this folder without using the index
+                if not (self.folder / f"map{index}").exists():
+                    map_names.append(f"map{index}")
+                index += 1
+            self.save_next_index(index)
+        return map_names
+
+    def record(self, entries: Dict[str, dict], parameters: dict):
+        '''
+        Append the given maps ({map_name: entry}) of one run together with the parameters of the run to the index.
+        '''
+        if len(entries) == 0:
+            return
+        line = json.dumps({"parameters": parameters, "maps": entries}, separators=(",", ":")) + "\n"
+        with self.lock():
+            with open(str(self.maps_path), "a") as file:
+                file.write(line)
+
+    def load_maps(self) -> Dict[str, dict]:
+        '''
+        Return the entries of all recorded maps ({map_name: entry}), each with the parameters of its run.
+        '''
+        maps = {}
+        if not self.maps_path.exists():
+            return maps
+        with open(str(self.maps_path), "r") as file:
+            for line in file:
+                # the last line might still be written by another generator
+                if not line.endswith("\n"):
+                    break
+                run = json.loads(line)
+                for map_name, entry in run["maps"].items():
+                    maps[map_name] = dict(entry, parameters=run["parameters"])
+        return maps
+
+
+def get_image_file_name(map_name: str, image_format: ImageFormat = ImageFormat.PNG) -> str:
+    return map_name + IMAGE_FILE_ENDINGS[image_format]
+
+
+def create_yaml_files(map_folder_path: pathlib.Path, resolution: float, seed: int = None,
+                      image_format: ImageFormat = ImageFormat.PNG):
+    '''
+    Create the files map.yaml (ROS) and map.wordl.yaml (Flatland) for the map.
+    map_folder_path: path to folder for this map e.g.: /home/user/catkin_ws/src/arena-rosnav/simulator_setup/maps/mymap
+    seed: seed of the random generator the map was created with, will be saved in map.yaml if given
+    image_format: format of the map image, needed for the file name
+    '''
+    map_folder = pathlib.Path(map_folder_path)
+    map_name = map_folder.parts[-1]
+
+    # create map.yaml
+    map_yaml = {
+        "image": get_image_file_name(map_name, image_format),
+        "resolution": resolution,
+        "origin": [0.0, 0.0, 0.0],  # [-x,-y,0.0]
+        "negate": 0,
+        "occupied_thresh": 0.65,
+        "free_thresh": 0.196
+    }
+    if seed is not None:
+        map_yaml["seed"] = int(seed)
+
+    with open(str(map_folder / "map.yaml"), 'w') as outfile:
+        yaml.dump(map_yaml, outfile, sort_keys=False,
+                  default_flow_style=None)
+
+    # create map.world.yaml
+    world_yaml_properties = {
+        "properties": {
+            "velocity_iterations": 10,
+            "position_iterations": 10
+        }
+    }
+
+    world_yaml_layers = {
+        "layers": [
+            {
+                "name": "static",
+                "map": "map.yaml",
+                "color": [0, 1, 0, 1]
+            }
+        ]
+    }
+
+    with open(str(map_folder / "map.world.yaml"), 'w') as outfile:
+        # somehow the first part must be with default_flow_style=False
+        yaml.dump(world_yaml_properties, outfile,
+                  sort_keys=False, default_flow_style=False)
+        # 2nd part must be with default_flow_style=None
+        yaml.dump(world_yaml_layers, outfile,
+                  sort_keys=False, default_flow_style=None)
+
+
+def make_image(map: np.ndarray, maps_folder_path: pathlib.Path, map_name: str,
+               image_format: ImageFormat = ImageFormat.PNG, compress_level: int = 6) -> int:
+    '''
+    Create image file from occupancy map (1:occupied, 0:free).
+    - map: numpy array
+    - maps_folder_path: path to maps folder e.g.: /home/user/catkin_ws/src/arena-rosnav/simulator_setup/maps
+    - map_name: name of map, a folder will be created using this name
+    - image_format: PNG (8 bit grayscale), PNG1 (1 bit) or PGM (8 bit binary)
+    - compress_level: zlib compression level for PNG files, 0 (none) - 9 (best)
+    Returns the number of bytes written.
+    Raises FileExistsError if the map folder already exists, existing maps are never overwritten.
+    '''
+    # create new directory for map
+    map_folder = pathlib.Path(maps_folder_path) / map_name
+    os.mkdir(str(map_folder))
+    map = np.asarray(map, dtype=np.uint8)
+    height, width = map.shape
+    # save map in map directory
+    with open(str(map_folder / get_image_file_name(map_name, image_format)), "wb") as file:
+        if image_format == ImageFormat.PNG1:
+            # pack 8 pixels into each byte, "1;I" means a set bit is black (occupied)
+            bits = np.packbits(map, axis=1)
+            img = Image.frombuffer("1", (width, height), bits, "raw", "1;I", 0, 1)
+            img.save(file, format="PNG", compress_level=compress_level)
+        else:
+            # monochromatic 8 bit grayscale image: occupied (1) -> black (0), free (0) -> white (255)
+            # uint8 arithmetic wraps around, so 0 - 1 results in 255
+            pixels = np.subtract(map, 1, dtype=np.uint8)
+            if image_format == ImageFormat.PGM:
+                file.write(f"P5\n{width} {height}\n255\n".encode("ascii"))
+                file.write(pixels.data)
+            else:
+                img = Image.fromarray(pixels)  # 2D uint8 arrays become "L" images
+                img.save(file, format="PNG", compress_level=compress_level)
+        return file.tell()
+
+
+# create empty map with format given by height,width and initialize empty tree
+# maps are stored as uint8 (1:occupied, 0:free) to keep memory usage at 1 byte per cell
+def initialize_map(height, width, type="indoor"):
+    if type == "outdoor":
+        map = np.ones((height, width), dtype=np.uint8)
+        map[slice(1, height-1), slice(1, width-1)] = 0
+        return map
+    else:
+        return np.ones((height, width), dtype=np.uint8)
+
+
+def insert_root_node(map, tree):  # create root node in center of map
+    root_node = [int(np.floor(map.shape[0]/2)),
+                 int(np.floor(map.shape[1]/2))]
+    map[root_node[0], root_node[1]] = 0
+    tree.append(root_node)
+
+
+# sample position from map within boundary and leave tolerance for corridor width
+def sample(map, corridor_radius, rng: np.random.Generator):
+    random_x = int(rng.integers(corridor_radius+2, map.shape[0]-corridor_radius-1))
+    random_y = int(rng.integers(corridor_radius+2, map.shape[1]-corridor_radius-1))
+    return [random_x, random_y]
+
+
+class NodeIndex:
+    '''
+    Spatial index for the nodes of the tree that is grown in create_indoor_map.
+    Nodes are stored in a preallocated NumPy array that grows by doubling,
+    so the nearest node can be found with a single vectorized argmin instead of a Python loop.
+    '''
+    def __init__(self, capacity: int = 64):
+        self.nodes = np.empty((max(capacity, 1), 2), dtype=np.int64)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, node):
+        if self.count == len(self.nodes):
+            grown = np.empty((2 * len(self.nodes), 2), dtype=np.int64)
+            grown[:self.count] = self.nodes[:self.count]
+            self.nodes = grown
+        self.nodes[self.count] = node
+        self.count += 1
+
+    def nearest(self, position) -> List[int]:
+        '''
+        Return the node with the smallest L1 distance to position.
+        Ties are resolved like in find_nearest_node: the node inserted first wins.
+        '''
+        nodes = self.nodes[:self.count]
+        distances = np.abs(nodes[:, 0] - position[0]) + np.abs(nodes[:, 1] - position[1])
+        nearest = nodes[np.argmin(distances)]
+        return [int(nearest[0]), int(nearest[1])]
+
+
+# find nearest node according to L1 norm
+# linear scan over a list of nodes, NodeIndex.nearest() is much faster for large trees
+def find_nearest_node(random_position, tree):
+    nearest_node = []
+    min_distance = np.inf
+    for node in tree:
+        distance = sum(np.abs(np.array(random_position)-np.array(node)))
+        if distance < min_distance:
+            min_distance = distance
+            nearest_node = node
+    return nearest_node
+
+
+# insert new node into the map and tree
+def insert_new_node(random_position, tree, map):
+    map[random_position[0], random_position[1]] = 0
+    tree.append(random_position)
+
+
+def get_constellation(node1, node2):
+    # there are two relevant constellations for the 2 nodes, which must be considered when creating the horizontal and vertical path
+    # 1: lower left and upper right
+    # 2: upper left and lower right
+    # each of the 2 constellation have 2 permutations which must be considered as well
+    constellation1 = {
+        # x1>x2 and y1<y2
+        "permutation1": node1[0] > node2[0] and node1[1] < node2[1],
+        "permutation2": node1[0] < node2[0] and node1[1] > node2[1]}  # x1<x2 and y1>y2
+    if constellation1["permutation1"] or constellation1["permutation2"]:
+        return 1
+    else:
+        return 2
+
+
+def create_path(node1, node2, corridor_radius, map, rng: np.random.Generator):
+    coin_flip = rng.random()
+    # x and y coordinates must be sorted for usage with slices
+    x1, x2 = sorted([node1[0], node2[0]])
+    y1, y2 = sorted([node1[1], node2[1]])
+    r = corridor_radius
+    if get_constellation(node1, node2) == 1:  # check which constellation
+        # randomly determine the curvature of the path (right turn/left turn)
+        if coin_flip >= 0.5:
+            map[x1-r:x1+r+1, y1-r:y2+r+1] = 0  # horizontal path
+            map[x1-r:x2+r+1, y1-r:y1+r+1] = 0  # vertical path
+        else:
+            map[x2-r:x2+r+1, y1-r:y2+r+1] = 0  # horizontal path
+            map[x1-r:x2+r+1, y2-r:y2+r+1] = 0  # vertical path
+    else:
+        # randomly determine the curvature of the path (right turn/left turn)
+        if coin_flip >= 0.5:
+            map[x1-r:x1+r+1, y1-r:y2+r+1] = 0  # horizontal path
+            map[x1-r:x2+r+1, y2-r:y2+r+1] = 0  # vertical path
+        else:
+            map[x2-r:x2+r+1, y1-r:y2+r+1] = 0  # horizontal path
+            map[x1-r:x2+r+1, y1-r:y1+r+1] = 0  # vertical path
+
+
+def create_indoor_map(height, width, corridor_radius, iterations, rng: np.random.Generator = None,
+                      is_cancelled: Callable[[], bool] = None):
+    '''
+    Grow a random tree of corridors.
+    is_cancelled is checked before every iteration, None is returned as soon as it returns True.
+    '''
+    if rng is None:
+        rng = np.random.default_rng()
+    tree = NodeIndex(iterations + 1)  # initialize empty tree
+    map = initialize_map(height, width)
+    insert_root_node(map, tree)
+    for i in range(iterations):  # create as many paths/nodes as defined in iteration
+        if is_cancelled is not None and is_cancelled():
+            return None
+        random_position = sample(map, corridor_radius, rng)
+        # nearest node must be found before inserting the new node into the tree, else nearest node will be itself
+        nearest_node = tree.nearest(random_position)
+        insert_new_node(random_position, tree, map)
+        create_path(random_position, nearest_node,
+                    corridor_radius, map, rng)
+    return map
+
+
+def rasterize_rectangles(shape, x_min: np.ndarray, x_max: np.ndarray, y_min: np.ndarray, y_max: np.ndarray) -> np.ndarray:
+    '''
+    Rasterize axis aligned rectangles (bounds are inclusive) into a boolean mask of the given shape.
+    Uses a 2D difference array: every rectangle only touches its 4 corners,
+    the cumulative sums along both axes then fill in all rectangles at once.
+    '''
+    height, width = shape
+    row_length = width + 1
+    plus = np.concatenate([x_min * row_length + y_min, (x_max + 1) * row_length + y_max + 1])
+    minus = np.concatenate([x_min * row_length + y_max + 1, (x_max + 1) * row_length + y_min])
+    size = (height + 1) * row_length
+    # counts are at most the number of rectangles, int32 keeps the temporary array small
+    diff = np.bincount(plus, minlength=size).astype(np.int32)
+    diff -= np.bincount(minus, minlength=size)
+    diff = diff.reshape(height + 1, row_length)
+    np.cumsum(diff, axis=0, out=diff)
+    np.cumsum(diff, axis=1, out=diff)
+    return diff[:height, :width] > 0
+
+
+def rasterize_circles(shape, x_center: np.ndarray, y_center: np.ndarray, radius: int) -> np.ndarray:
+    '''
+    Rasterize circles with the same radius into a boolean mask of the given shape.
+    Every circle is split into one horizontal run per row. The runs are written into a row wise
+    difference array, the cumulative sum along each row then fills in all circles at once.
+    '''
+    height, width = shape
+    row_length = width + 1
+    offsets = np.arange(-radius, radius + 1)
+    half_widths = np.floor(np.sqrt(radius ** 2 - offsets ** 2)).astype(np.int64)
+    rows = x_center[:, None] + offsets[None, :]
+    starts = rows * row_length + (y_center[:, None] - half_widths[None, :])
+    ends = rows * row_length + (y_center[:, None] + half_widths[None, :] + 1)
+    size = height * row_length
+    diff = np.bincount(starts.ravel(), minlength=size).astype(np.int32)
+    diff -= np.bincount(ends.ravel(), minlength=size)
+    diff = diff.reshape(height, row_length)
+    np.cumsum(diff, axis=1, out=diff)
+    return diff[:, :width] > 0
+
+
+def create_outdoor_map(height, width, obstacle_number, obstacle_extra_radius, rng: np.random.Generator = None,
+                       obstacle_shape: ObstacleShape = ObstacleShape.SQUARE):
+    if rng is None:
+        rng = np.random.default_rng()
+    map = initialize_map(height, width, type="outdoor")
+    if obstacle_number <= 0:
+        return map
+    r = obstacle_extra_radius
+    # sample all obstacle centers at once, leave tolerance for the obstacle radius (same bounds as sample())
+    centers = rng.integers([r+2, r+2], [height-r-1, width-r-1], size=(obstacle_number, 2))
+    x, y = centers[:, 0], centers[:, 1]
+    if obstacle_shape == ObstacleShape.SQUARE:
+        # 1 pixel obstacles with extra radius if specified
+        obstacles = rasterize_rectangles(map.shape, x - r, x + r, y - r, y + r)
+    elif obstacle_shape == ObstacleShape.CIRCLE:
+        obstacles = rasterize_circles(map.shape, x, y, r)
+    elif obstacle_shape == ObstacleShape.RECTANGLE:
+        # random extent in both directions, at most as big as the square obstacle
+        half_sizes = rng.integers(0, r+1, size=(obstacle_number, 2))
+        obstacles = rasterize_rectangles(map.shape, x - half_sizes[:, 0], x + half_sizes[:, 0],
+                                         y - half_sizes[:, 1], y + half_sizes[:, 1])
+    map |= obstacles
+    return map
+
+
+def generate_map(params: MapGenerationParameters, rng: np.random.Generator = None,
+                 is_cancelled: Callable[[], bool] = None) -> np.ndarray:
+    '''
+    Generate a single occupancy map (1:occupied, 0:free) with the given parameters.
+    All random values are drawn from rng, so the same seed always results in the same map.
+    Returns None if the map is too small or if is_cancelled returned True during generation.
+    '''
+    if params.height < 10 or params.width < 10:
+        return None
+    map_array = None
+    if params.map_type == MapType.INDOOR:
+        map_array = create_indoor_map(
+            params.height, params.width, params.corridor_radius, params.iterations, rng, is_cancelled)
+    elif params.map_type == MapType.OUTDOOR:
+        map_array = create_outdoor_map(
+            params.height, params.width, params.obstacle_number, params.obstacle_extra_radius, rng,
+            params.obstacle_shape)
+
+    return map_array
+
+
+def generate_and_save_map(maps_folder_path: pathlib.Path, map_name: str, params: MapGenerationParameters,
+                          seed: int) -> MapFileStats:
+    '''
+    Generate a map from its own random generator seeded with seed and save it into maps_folder_path/map_name.
+    Returns size of and time needed for writing the image file.
+    Raises FileExistsError if the map folder already exists.
+    '''
+    stats = MapFileStats(map_name)
+    map_array = generate_map(params, np.random.default_rng(seed))
+    if map_array is not None:
+        stats.checksum = hashlib.sha1(np.ascontiguousarray(map_array, dtype=np.uint8).data).hexdigest()
+        start_time = time.perf_counter()
+        stats.bytes_written = make_image(map_array, maps_folder_path, map_name,
+                                         params.image_format, params.compress_level)
+        stats.write_time = time.perf_counter() - start_time
+        create_yaml_files(pathlib.Path(maps_folder_path) / map_name, params.resolution, seed, params.image_format)
+    return stats
+
+
+def _generate_and_save_map_job(job: tuple) -> MapFileStats:
+    # unpack arguments for use with multiprocessing.Pool.imap_unordered
+    return generate_and_save_map(*job)
+
+
+def get_random_seed() -> int:
+    return int(np.random.SeedSequence().generate_state(1)[0])
+
+
+def generate_maps(maps_folder_path: pathlib.Path, number_of_maps: int, params: MapGenerationParameters,
+                  seed: int = None, workers: int = 1,
+                  progress_callback: Callable[[int, int], None] = None,
+                  file_stats: List[MapFileStats] = None) -> List[str]:
+    '''
+    Generate maps and save each one into its own folder inside the maps folder.
+    - maps_folder_path: path to maps folder e.g.: /home/user/catkin_ws/src/arena-rosnav/simulator_setup/maps
+    - number_of_maps: number of maps to generate
+    - params: settings for all maps
+    - seed: master seed, map i is generated with seed + i. A random master seed is used if None.
+    - workers: number of worker processes, maps are generated in the calling process if 1
+    - progress_callback: called after each map with the number of finished maps and the total number of maps
+    - file_stats: if given, a MapFileStats object for every map will be appended to this list
+    Map names are reserved in the MapFolderIndex of the maps folder, so several runs can write into the same folder
+    at once. Parameters, seed and checksum of every written map are added to the index when the run ends.
+    Returns the names of the generated maps.
+    '''
+    path = pathlib.Path(maps_folder_path)
+    folder_index = MapFolderIndex(path)
+    map_names = folder_index.reserve(number_of_maps)
+    if seed is None:
+        seed = get_random_seed()
+    jobs = [(path, map_name, params, seed + i) for i, map_name in enumerate(map_names)]
+    seeds = {map_name: map_seed for _, map_name, _, map_seed in jobs}
+    index_entries = {}
+
+    if workers == 1 or len(jobs) <= 1:
+        results = map(_generate_and_save_map_job, jobs)
+        pool = None
+    else:
+        # hand out jobs in chunks to keep the inter-process overhead low
+        chunksize = max(1, min(64, len(jobs) // (workers * 8)))
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(_generate_and_save_map_job, jobs, chunksize)
+
+    try:
+        for i, stats in enumerate(results):
+            if file_stats is not None:
+                file_stats.append(stats)
+            if stats.checksum != "":
+                index_entries[stats.map_name] = {
+                    "seed": seeds[stats.map_name],
+                    "checksum": stats.checksum,
+                    "image": get_image_file_name(stats.map_name, params.image_format),
+                }
+            if progress_callback is not None:
+                progress_callback(i + 1, len(jobs))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        # record finished maps even if the run was aborted
+        folder_index.record(index_entries, params.toDict())
+
+    return map_names
+
+
+class ProgressReporter:
+    '''
+    Print progress and throughput of a map generation run at most once per interval (in seconds).
+    '''
+    def __init__(self, interval: float = 1.0, file=sys.stdout):
+        self.interval = interval
+        self.file = file
+        self.start_time = time.perf_counter()
+        self.last_report_time = self.start_time
+
+    def __call__(self, done: int, total: int):
+        now = time.perf_counter()
+        if now - self.last_report_time < self.interval and done != total:
+            return
+        self.last_report_time = now
+        elapsed = now - self.start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        remaining = (total - done) / rate if rate > 0 else 0.0
+        print(f"[{done}/{total}] {100 * done / max(total, 1):5.1f}% | {rate:8.1f} maps/s | eta {remaining:6.1f}s",
+              file=self.file, flush=True)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Generate random ROS maps without a GUI.")
+    parser.add_argument("folder", help="maps folder, each map will be saved in its own subfolder")
+    parser.add_argument("-n", "--number", type=int, default=1, help="number of maps to generate")
+    parser.add_argument("-t", "--type", choices=[t.name.lower() for t in MapType], default="indoor")
+    parser.add_argument("--width", type=int, default=101)
+    parser.add_argument("--height", type=int, default=101)
+    parser.add_argument("--corridor-radius", type=int, default=3, help="indoor maps only")
+    parser.add_argument("--iterations", type=int, default=100, help="indoor maps only")
+    parser.add_argument("--obstacles", type=int, default=20, help="outdoor maps only")
+    parser.add_argument("--obstacle-extra-radius", type=int, default=2, help="outdoor maps only")
+    parser.add_argument("--obstacle-shape", choices=[s.name.lower() for s in ObstacleShape], default="square",
+                        help="outdoor maps only")
+    parser.add_argument("--resolution", type=float, default=0.5)
+    parser.add_argument("--image-format", choices=[f.name.lower() for f in ImageFormat], default="png",
+                        help="png: 8 bit grayscale, png1: 1 bit (smallest, but not read correctly by ROS map_server), "
+                             "pgm: uncompressed binary (fastest)")
+    parser.add_argument("--compression", type=int, choices=range(10), default=6, metavar="{0-9}",
+                        help="PNG compression level, 0 is fastest and 9 gives the smallest files")
+    parser.add_argument("--fast", action="store_true",
+                        help=f"shortcut for --compression {FAST_COMPRESS_LEVEL}")
+    parser.add_argument("-s", "--seed", type=int, default=None,
+                        help="master seed, map i of this run is generated with seed + i (random if not given)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="number of worker processes, 0 uses all CPU cores")
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't print progress")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print size and write time of every map")
+    args = parser.parse_args(argv)
+
+    params = MapGenerationParameters()
+    params.map_type = MapType[args.type.upper()]
+    params.width = args.width
+    params.height = args.height
+    params.corridor_radius = args.corridor_radius
+    params.iterations = args.iterations
+    params.obstacle_number = args.obstacles
+    params.obstacle_extra_radius = args.obstacle_extra_radius
+    params.obstacle_shape = ObstacleShape[args.obstacle_shape.upper()]
+    params.resolution = args.resolution
+    params.image_format = ImageFormat[args.image_format.upper()]
+    params.compress_level = FAST_COMPRESS_LEVEL if args.fast else args.compression
+
+    folder = pathlib.Path(args.folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+    seed = args.seed if args.seed is not None else get_random_seed()
+    if not args.quiet:
+        print(f"Generating {args.number} {args.type} maps with {workers} worker(s), master seed {seed}")
+
+    progress = None if args.quiet else ProgressReporter()
+    start_time = time.perf_counter()
+    file_stats = []
+    map_names = generate_maps(folder, args.number, params, seed, workers, progress, file_stats)
+    elapsed = time.perf_counter() - start_time
+
+    if args.verbose:
+        for stats in sorted(file_stats, key=lambda s: s.map_name):
+            print(f"{stats.map_name}: {stats.bytes_written / 1024:.1f} KB in {1000 * stats.write_time:.2f} ms "
+                  f"({stats.getThroughput() / 1e6:.1f} MB/s)")
+
+    if len(map_names) > 0:
+        print(f"Generated {len(map_names)} maps ({map_names[0]} - {map_names[-1]}) in {elapsed:.2f}s: "
+              f"{len(map_names) / elapsed:.1f} maps/s, {1000 * elapsed / len(map_names):.2f} ms/map")
+        total = MapFileStats("total", sum(s.bytes_written for s in file_stats), sum(s.write_time for s in file_stats))
+        print(f"Wrote {total.bytes_written / 1e6:.2f} MB of {args.image_format} images: "
+              f"{total.bytes_written / 1024 / len(map_names):.1f} KB/map, {total.getThroughput() / 1e6:.1f} MB/s, "
+              f"{1000 * total.write_time / len(map_names):.2f} ms/map")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,29 @@
 from PyQt5 import QtGui, QtCore, QtWidgets
 import numpy as np
 import os
-import yaml
-import shutil
 import pathlib
-import re
-import subprocess
 from typing import List
-from PIL import Image
-from enum import Enum
 from HelperFunctions import *
 from QtExtensions import *
+from MapGeneration import *
 
 
-class MapType(Enum):
-    INDOOR = 0
-    OUTDOOR = 1
+class MapPreviewWorker(QtCore.QThread):
+    '''
+    Generates a preview map in a background thread.
+    Generation stops early when requestInterruption() is called, in that case no result is sent.
+    '''
+    previewReady = QtCore.pyqtSignal(int, object)  # request id, map array (or None if the map is too small)
+
+    def __init__(self, request_id: int, params: MapGenerationParameters, **kwargs):
+        super().__init__(**kwargs)
+        self.request_id = request_id
+        self.params = params
+
+    def run(self):
+        map_array = generate_map(self.params, is_cancelled=self.isInterruptionRequested)
+        if not self.isInterruptionRequested():
+            self.previewReady.emit(self.request_id, map_array)
 
 
 class MapGenerator(QtWidgets.QMainWindow):
@@ -32,6 +40,17 @@ class MapGenerator(QtWidgets.QMainWindow):
         self.view.setHorizontalScrollBarPolicy(
             QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
+        # buffer of the currently displayed preview, the preview QImage points to this memory
+        self.preview_buffer = None
+        # only the result of the latest preview request will be displayed
+        self.preview_request_id = 0
+        self.preview_workers = []  # keep references to running workers until they are finished
+        # restart timer on every change so the preview is only generated once the user stops changing values
+        self.preview_timer = QtCore.QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(150)
+        self.preview_timer.timeout.connect(self.showPreview)
+
         self.setup_ui()
         self.updateWidgetsFromSelectedType(self.type_dropdown.currentIndex())
         self.showPreview()
@@ -76,7 +95,7 @@ class MapGenerator(QtWidgets.QMainWindow):
         self.width_spin_box.setValue(101)
         self.width_spin_box.setSingleStep(1)
         self.width_spin_box.setFixedSize(150, 30)
-        self.width_spin_box.valueChanged.connect(self.showPreview)
+        self.width_spin_box.valueChanged.connect(self.schedulePreview)
         frame.layout().addWidget(self.width_spin_box, layout_index,
                                  1, QtCore.Qt.AlignmentFlag.AlignRight)
         layout_index += 1
@@ -93,7 +112,7 @@ class MapGenerator(QtWidgets.QMainWindow):
         self.height_spin_box.setValue(101)
         self.height_spin_box.setSingleStep(1)
         self.height_spin_box.setFixedSize(150, 30)
-        self.height_spin_box.valueChanged.connect(self.showPreview)
+        self.height_spin_box.valueChanged.connect(self.schedulePreview)
         frame.layout().addWidget(self.height_spin_box, layout_index,
                                  1, QtCore.Qt.AlignmentFlag.AlignRight)
         layout_index += 1
@@ -128,7 +147,7 @@ class MapGenerator(QtWidgets.QMainWindow):
         self.corridor_width_spin_box.setValue(3)
         self.corridor_width_spin_box.setSingleStep(1)
         self.corridor_width_spin_box.setFixedSize(150, 30)
-        self.corridor_width_spin_box.valueChanged.connect(self.showPreview)
+        self.corridor_width_spin_box.valueChanged.connect(self.schedulePreview)
         frame.layout().addWidget(self.corridor_width_spin_box,
                                  layout_index, 1, QtCore.Qt.AlignmentFlag.AlignRight)
         layout_index += 1
@@ -141,11 +160,11 @@ class MapGenerator(QtWidgets.QMainWindow):
                                  0, QtCore.Qt.AlignmentFlag.AlignLeft)
         # spinbox
         self.iterations_spin_box = QtWidgets.QSpinBox()
-        self.iterations_spin_box.setRange(0, 1000)
+        self.iterations_spin_box.setRange(0, 10000)
         self.iterations_spin_box.setValue(100)
         self.iterations_spin_box.setSingleStep(1)
         self.iterations_spin_box.setFixedSize(150, 30)
-        self.iterations_spin_box.valueChanged.connect(self.showPreview)
+        self.iterations_spin_box.valueChanged.connect(self.schedulePreview)
         frame.layout().addWidget(self.iterations_spin_box, layout_index,
                                  1, QtCore.Qt.AlignmentFlag.AlignRight)
         layout_index += 1
@@ -158,11 +177,11 @@ class MapGenerator(QtWidgets.QMainWindow):
                                  0, QtCore.Qt.AlignmentFlag.AlignLeft)
         # spinbox
         self.obstacles_spin_box = QtWidgets.QSpinBox()
-        self.obstacles_spin_box.setRange(0, 1000)
+        self.obstacles_spin_box.setRange(0, 1000000)
         self.obstacles_spin_box.setValue(20)
         self.obstacles_spin_box.setSingleStep(1)
         self.obstacles_spin_box.setFixedSize(150, 30)
-        self.obstacles_spin_box.valueChanged.connect(self.showPreview)
+        self.obstacles_spin_box.valueChanged.connect(self.schedulePreview)
         frame.layout().addWidget(self.obstacles_spin_box, layout_index,
                                  1, QtCore.Qt.AlignmentFlag.AlignRight)
         layout_index += 1
@@ -180,11 +199,29 @@ class MapGenerator(QtWidgets.QMainWindow):
         self.obstacle_size_spin_box.setValue(2)
         self.obstacle_size_spin_box.setSingleStep(1)
         self.obstacle_size_spin_box.setFixedSize(150, 30)
-        self.obstacle_size_spin_box.valueChanged.connect(self.showPreview)
+        self.obstacle_size_spin_box.valueChanged.connect(self.schedulePreview)
         frame.layout().addWidget(self.obstacle_size_spin_box,
                                  layout_index, 1, QtCore.Qt.AlignmentFlag.AlignRight)
         layout_index += 1
 
+        # obstacle shape
+        # label
+        self.obstacle_shape_label = QtWidgets.QLabel("### Obstacle Shape")
+        self.obstacle_shape_label.setTextFormat(
+            QtCore.Qt.TextFormat.MarkdownText)
+        frame.layout().addWidget(self.obstacle_shape_label,
+                                 layout_index, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
+        # dropdown
+        self.obstacle_shape_dropdown = QtWidgets.QComboBox()
+        for obstacle_shape in ObstacleShape:
+            self.obstacle_shape_dropdown.insertItem(
+                obstacle_shape.value, obstacle_shape.name.lower())
+        self.obstacle_shape_dropdown.setFixedSize(150, 30)
+        self.obstacle_shape_dropdown.currentIndexChanged.connect(self.schedulePreview)
+        frame.layout().addWidget(self.obstacle_shape_dropdown,
+                                 layout_index, 1, QtCore.Qt.AlignmentFlag.AlignRight)
+        layout_index += 1
+
         # line
         line = Line()
         frame.layout().addWidget(line, layout_index, 0, 1, -1)
@@ -253,6 +290,15 @@ class MapGenerator(QtWidgets.QMainWindow):
         frame.layout().addWidget(self.result_label, layout_index, 0, 1, -1)
         layout_index += 1
 
+        # busy indicator shown while a preview is generated
+        self.preview_progress_bar = QtWidgets.QProgressBar()
+        self.preview_progress_bar.setRange(0, 0)
+        self.preview_progress_bar.setFormat("Generating preview...")
+        self.preview_progress_bar.setTextVisible(True)
+        self.preview_progress_bar.hide()
+        frame.layout().addWidget(self.preview_progress_bar, layout_index, 0, 1, -1)
+        layout_index += 1
+
         # generate maps result label animation
         self.result_label_animation = QtCore.QPropertyAnimation(
             self, b"text_color", self)
@@ -268,7 +314,7 @@ class MapGenerator(QtWidgets.QMainWindow):
         self.splitter.setSizes([300, 700])
 
     def handleTypeChanged(self):
-        self.showPreview()
+        self.schedulePreview()
         self.updateWidgetsFromSelectedType(self.type_dropdown.currentIndex())
 
     def getTextColor(self) -> QtGui.QColor:
@@ -286,27 +332,18 @@ class MapGenerator(QtWidgets.QMainWindow):
         s = f"Generate {value} maps"
         self.generate_maps_button.setText(s)
 
-    def getMapNames(self) -> List[str]:
-        '''
-        Generate simple map names that don't exist yet in the form of f"map{index}".
-        Search the maps folder for already existing maps in this format. Get the highest index and then
-        start counting from there.
-        '''
-        folder = pathlib.Path(self.folder_edit.text())
-        map_folders = [p for p in folder.iterdir() if p.is_dir()]
-        names = [p.parts[-1] for p in map_folders]
-        # get only the names that are in the form of f"map{index}"
-        prefix = "map"
-        pat = re.compile(f"{prefix}\d+$", flags=re.ASCII)
-        filtered_names = [name for name in names if pat.match(name) != None]
-        # get the max index that already exists
-        max_index = 0
-        if len(filtered_names) > 0:
-            max_index = max([int(name[len(prefix):])
-                            for name in filtered_names])
-        number_of_maps = self.number_of_maps_spin_box.value()
-        # generate new names beginning with the max index
-        return [f"map{i}" for i in range(max_index+1, max_index+1+number_of_maps)]
+    def getParameters(self) -> MapGenerationParameters:
+        params = MapGenerationParameters()
+        params.map_type = MapType(self.type_dropdown.currentIndex())
+        params.height = self.height_spin_box.value()
+        params.width = self.width_spin_box.value()
+        params.corridor_radius = self.corridor_width_spin_box.value()
+        params.iterations = self.iterations_spin_box.value()
+        params.obstacle_number = self.obstacles_spin_box.value()
+        params.obstacle_extra_radius = self.obstacle_size_spin_box.value()
+        params.obstacle_shape = ObstacleShape(self.obstacle_shape_dropdown.currentIndex())
+        params.resolution = self.resolution_spin_box.value()
+        return params
 
     def onGenerateMapsClicked(self):
         # generate maps
@@ -315,12 +352,8 @@ class MapGenerator(QtWidgets.QMainWindow):
         path = pathlib.Path(self.folder_edit.text())
 
         # create new maps with appropriate names
-        map_names = self.getMapNames()
-        for map_name in map_names:
-            map_array = self.getCurrentMap()
-            if map_array is not None:
-                self.make_image(map_array, path, map_name)
-                self.create_yaml_files(path / map_name)
+        params = self.getParameters()
+        map_names = generate_maps(path, self.number_of_maps_spin_box.value(), params)
 
         # update result text
         if len(map_names) > 0:
@@ -342,7 +375,7 @@ class MapGenerator(QtWidgets.QMainWindow):
         offset_hor = 0
         offset_ver = 0
         for map_name in map_names:
-            image_path = path / map_name / f"{map_name}.png"
+            image_path = path / map_name / get_image_file_name(map_name, params.image_format)
             pixmap = QtGui.QPixmap(str(image_path))
             pixmap_item = QtWidgets.QGraphicsPixmapItem(pixmap)
             pixmap_item.setOffset(offset_hor, offset_ver)
@@ -352,67 +385,87 @@ class MapGenerator(QtWidgets.QMainWindow):
                             (height / 3)), mode=QtCore.Qt.AspectRatioMode.KeepAspectRatio)
 
     def getCurrentMap(self) -> np.ndarray:
-        map_type = MapType(self.type_dropdown.currentIndex())
-        height = self.height_spin_box.value()
-        width = self.width_spin_box.value()
-        if height < 10 or width < 10:
-            return None
-        map_array = None
-        if map_type == MapType.INDOOR:
-            corridor_radius = self.corridor_width_spin_box.value()
-            iterations = self.iterations_spin_box.value()
-            map_array = self.create_indoor_map(
-                height, width, corridor_radius, iterations)
-        elif map_type == MapType.OUTDOOR:
-            obstacle_number = self.obstacles_spin_box.value()
-            obstacle_extra_radius = self.obstacle_size_spin_box.value()
-            map_array = self.create_outdoor_map(
-                height, width, obstacle_number, obstacle_extra_radius)
-
-        return map_array
-
-    def getXpmFromNdarray(self, a: np.ndarray) -> List[str]:
-        height, width = a.shape
-        xpm = []
-        xpm.append(f"{width} {height} 2 1")
-        xpm.append("1 c #000000")
-        xpm.append("0 c #FFFFFF")
-        for i in range(height):
-            line = ""
-            for j in range(width):
-                line += str(int(a[i, j]))
-            xpm.append(line)
-        return xpm
+        return generate_map(self.getParameters())
+
+    def getQImageFromNdarray(self, a: np.ndarray) -> QtGui.QImage:
+        '''
+        Wrap an occupancy map (1:occupied, 0:free) in an indexed QImage without copying the pixel data.
+        The color table maps 0 to white and 1 to black. The returned image points to self.preview_buffer,
+        so the buffer is kept alive until the next preview replaces it.
+        '''
+        # only copies if the map isn't a contiguous uint8 array already
+        self.preview_buffer = np.ascontiguousarray(a, dtype=np.uint8)
+        height, width = self.preview_buffer.shape
+        image = QtGui.QImage(self.preview_buffer.data, width, height,
+                             self.preview_buffer.strides[0], QtGui.QImage.Format.Format_Indexed8)
+        image.setColorTable([QtGui.qRgb(255, 255, 255), QtGui.qRgb(0, 0, 0)])
+        return image
+
+    def schedulePreview(self):
+        '''
+        Show a new preview once the settings haven't changed for a short time.
+        '''
+        self.preview_timer.start()
 
     def showPreview(self):
         '''
-        Generate an example map with the current settings and display it.
+        Generate an example map with the current settings in a background thread.
+        It will be displayed once it's ready, unless a newer preview has been requested in the meantime.
+        '''
+        # cancel previews that are still running, their results are outdated
+        for worker in self.preview_workers:
+            worker.requestInterruption()
+
+        self.preview_request_id += 1
+        worker = MapPreviewWorker(self.preview_request_id, self.getParameters(), parent=self)
+        worker.previewReady.connect(self.displayPreview)
+        worker.finished.connect(lambda: self.handlePreviewWorkerFinished(worker))
+        self.preview_workers.append(worker)
+        self.preview_progress_bar.show()
+        worker.start()
+
+    def handlePreviewWorkerFinished(self, worker: MapPreviewWorker):
+        self.preview_workers.remove(worker)
+        worker.deleteLater()
+        if len(self.preview_workers) == 0:
+            self.preview_progress_bar.hide()
+
+    def displayPreview(self, request_id: int, map_array: np.ndarray):
+        '''
+        Display a generated preview map.
         '''
+        if request_id != self.preview_request_id:
+            # a newer preview has been requested, drop this one
+            return
+
         # clear scene
         items = self.scene.items()
         for item in items:
             self.scene.removeItem(item)
 
-        # generate a map
-        map_array = self.getCurrentMap()
-
         if map_array is None:
             return
 
         # add map to the scene
-        # generate XPM data from array
-        xpm = self.getXpmFromNdarray(map_array)
-        # get pixmap from XPM data
-        pixmap = QtGui.QPixmap(xpm)
+        image = self.getQImageFromNdarray(map_array)
+        pixmap = QtGui.QPixmap.fromImage(image)
         pixmap_item = QtWidgets.QGraphicsPixmapItem(pixmap)
         # add to scene
         self.scene.addItem(pixmap_item)
         # adjust view
-        height = self.height_spin_box.value()
-        width = self.width_spin_box.value()
+        height, width = map_array.shape
         self.view.fitInView(QtCore.QRectF(-5, -5, width + 5, height +
                             (height / 3)), mode=QtCore.Qt.AspectRatioMode.KeepAspectRatio)
 
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        # stop running previews before the window and its threads are destroyed
+        self.preview_timer.stop()
+        for worker in self.preview_workers:
+            worker.requestInterruption()
+        for worker in self.preview_workers:
+            worker.wait()
+        return super().closeEvent(event)
+
     def onBrowseClicked(self):
         path = QtWidgets.QFileDialog.getExistingDirectory(
             self, "Select Maps Folder", str(pathlib.Path.home()))
@@ -430,6 +483,8 @@ class MapGenerator(QtWidgets.QMainWindow):
             self.obstacles_spin_box.hide()
             self.obstacle_size_label.hide()
             self.obstacle_size_spin_box.hide()
+            self.obstacle_shape_label.hide()
+            self.obstacle_shape_dropdown.hide()
         elif map_type == MapType.OUTDOOR:
             self.corridor_width_label.hide()
             self.corridor_width_spin_box.hide()
@@ -439,177 +494,8 @@ class MapGenerator(QtWidgets.QMainWindow):
             self.obstacles_spin_box.show()
             self.obstacle_size_label.show()
             self.obstacle_size_spin_box.show()
-
-    def create_yaml_files(self, map_folder_path: pathlib.Path):
-        '''
-        Create the files map.yaml (ROS) and map.wordl.yaml (Flatland) for the map.
-        map_folder_path: path to folder for this map e.g.: /home/user/catkin_ws/src/arena-rosnav/simulator_setup/maps/mymap
-        '''
-        map_folder = pathlib.Path(map_folder_path)
-        map_name = map_folder.parts[-1]
-
-        # create map.yaml
-        map_yaml = {
-            "image": "{0}.png".format(map_name),
-            "resolution": self.resolution_spin_box.value(),
-            "origin": [0.0, 0.0, 0.0],  # [-x,-y,0.0]
-            "negate": 0,
-            "occupied_thresh": 0.65,
-            "free_thresh": 0.196
-        }
-
-        with open(str(map_folder / "map.yaml"), 'w') as outfile:
-            yaml.dump(map_yaml, outfile, sort_keys=False,
-                      default_flow_style=None)
-
-        # create map.world.yaml
-        world_yaml_properties = {
-            "properties": {
-                "velocity_iterations": 10,
-                "position_iterations": 10
-            }
-        }
-
-        world_yaml_layers = {
-            "layers": [
-                {
-                    "name": "static",
-                    "map": "map.yaml",
-                    "color": [0, 1, 0, 1]
-                }
-            ]
-        }
-
-        with open(str(map_folder / "map.world.yaml"), 'w') as outfile:
-            # somehow the first part must be with default_flow_style=False
-            yaml.dump(world_yaml_properties, outfile,
-                      sort_keys=False, default_flow_style=False)
-            # 2nd part must be with default_flow_style=None
-            yaml.dump(world_yaml_layers, outfile,
-                      sort_keys=False, default_flow_style=None)
-
-    def make_image(self, map: np.ndarray, maps_folder_path: pathlib.Path, map_name: str):
-        '''
-        Create PNG file from occupancy map (1:occupied, 0:free) and the necessary yaml files.
-        - map: numpy array
-        - maps_folder_path: path to maps folder e.g.: /home/user/catkin_ws/src/arena-rosnav/simulator_setup/maps
-        - map_name: name of map, a folder will be created using this name
-        '''
-        # create new directory for map
-        map_folder = maps_folder_path / map_name
-        if not map_folder.exists():
-            os.mkdir(str(map_folder))
-        # create image
-        # monochromatic image
-        img = Image.fromarray(((map-1)**2*255).astype('uint8'))
-        imgrgb = img.convert('RGB')
-        # save image
-        # save map in map directory
-        imgrgb.save(str(map_folder / (map_name + ".png")))
-
-    # create empty map with format given by height,width and initialize empty tree
-    def initialize_map(self, height, width, type="indoor"):
-        if type == "outdoor":
-            map = np.tile(1, [height, width])
-            map[slice(1, height-1), slice(1, width-1)] = 0
-            return map
-        else:
-            return np.tile(1, [height, width])
-
-    def insert_root_node(self, map, tree):  # create root node in center of map
-        root_node = [int(np.floor(map.shape[0]/2)),
-                     int(np.floor(map.shape[1]/2))]
-        map[root_node[0], root_node[1]] = 0
-        tree.append(root_node)
-
-    # sample position from map within boundary and leave tolerance for corridor width
-    def sample(self, map, corridor_radius):
-        random_x = np.random.choice(
-            range(corridor_radius+2, map.shape[0]-corridor_radius-1, 1))
-        random_y = np.random.choice(
-            range(corridor_radius+2, map.shape[1]-corridor_radius-1, 1))
-        return [random_x, random_y]
-
-    # find nearest node according to L1 norm
-    def find_nearest_node(self, random_position, tree):
-        nearest_node = []
-        min_distance = np.inf
-        for node in tree:
-            distance = sum(np.abs(np.array(random_position)-np.array(node)))
-            if distance < min_distance:
-                min_distance = distance
-                nearest_node = node
-        return nearest_node
-
-    # insert new node into the map and tree
-    def insert_new_node(self, random_position, tree, map):
-        map[random_position[0], random_position[1]] = 0
-        tree.append(random_position)
-
-    def get_constellation(self, node1, node2):
-        # there are two relevant constellations for the 2 nodes, which must be considered when creating the horizontal and vertical path
-        # 1: lower left and upper right
-        # 2: upper left and lower right
-        # each of the 2 constellation have 2 permutations which must be considered as well
-        constellation1 = {
-            # x1>x2 and y1<y2
-            "permutation1": node1[0] > node2[0] and node1[1] < node2[1],
-            "permutation2": node1[0] < node2[0] and node1[1] > node2[1]}  # x1<x2 and y1>y2
-        if constellation1["permutation1"] or constellation1["permutation2"]:
-            return 1
-        else:
-            return 2
-
-    def create_path(self, node1, node2, corridor_radius, map):
-        coin_flip = np.random.random()
-        # x and y coordinates must be sorted for usage with range function
-        x1, x2 = sorted([node1[0], node2[0]])
-        y1, y2 = sorted([node1[1], node2[1]])
-        if self.get_constellation(node1, node2) == 1:  # check which constellation
-            # randomly determine the curvature of the path (right turn/left turn)
-            if coin_flip >= 0.5:
-                map[slice(x1-corridor_radius, x1+corridor_radius+1), range(y1 -
-                                                                           corridor_radius, y2+1+corridor_radius, 1)] = 0  # horizontal path
-                map[range(x1-corridor_radius, x2+1+corridor_radius, 1), slice(y1 -
-                                                                              corridor_radius, y1+corridor_radius+1)] = 0  # vertical path
-            else:
-                map[slice(x2-corridor_radius, x2+corridor_radius+1), range(y1 -
-                                                                           corridor_radius, y2+1+corridor_radius, 1)] = 0  # horizontal path
-                map[range(x1-corridor_radius, x2+1+corridor_radius, 1), slice(y2 -
-                                                                              corridor_radius, y2+corridor_radius+1)] = 0  # vertical path
-        else:
-            # randomly determine the curvature of the path (right turn/left turn)
-            if coin_flip >= 0.5:
-                map[slice(x1-corridor_radius, x1+corridor_radius+1), range(y1 -
-                                                                           corridor_radius, y2+1+corridor_radius, 1)] = 0  # horizontal path
-                map[range(x1-corridor_radius, x2+1+corridor_radius, 1), slice(y2 -
-                                                                              corridor_radius, y2+corridor_radius+1)] = 0  # vertical path
-            else:
-                map[slice(x2-corridor_radius, x2+corridor_radius+1), range(y1 -
-                                                                           corridor_radius, y2+1+corridor_radius, 1)] = 0  # horizontal path
-                map[range(x1-corridor_radius, x2+1+corridor_radius, 1), slice(y1 -
-                                                                              corridor_radius, y1+corridor_radius+1)] = 0  # vertical path
-
-    def create_indoor_map(self, height, width, corridor_radius, iterations):
-        tree = []  # initialize empty tree
-        map = self.initialize_map(height, width)
-        self.insert_root_node(map, tree)
-        for i in range(iterations):  # create as many paths/nodes as defined in iteration
-            random_position = self.sample(map, corridor_radius)
-            # nearest node must be found before inserting the new node into the tree, else nearest node will be itself
-            nearest_node = self.find_nearest_node(random_position, tree)
-            self.insert_new_node(random_position, tree, map)
-            self.create_path(random_position, nearest_node,
-                             corridor_radius, map)
-        return map
-
-    def create_outdoor_map(self, height, width, obstacle_number, obstacle_extra_radius):
-        map = self.initialize_map(height, width, type="outdoor")
-        for i in range(obstacle_number):
-            random_position = self.sample(map, obstacle_extra_radius)
-            map[slice(random_position[0]-obstacle_extra_radius, random_position[0]+obstacle_extra_radius+1),  # create 1 pixel obstacles with extra radius if specified
-                slice(random_position[1]-obstacle_extra_radius, random_position[1]+obstacle_extra_radius+1)] = 1
-        return map
+            self.obstacle_shape_label.show()
+            self.obstacle_shape_dropdown.show()
 
 
 if __name__ == "__main__":
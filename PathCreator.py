@@ -40,7 +40,7 @@ class PathData:
     def saveToFile(self, path_in: str):
         with open(path_in, "w") as file:
             data = self.toDict()
-            json.dump(data, file, indent=4)
+            dump_json(data, file)
 
 
 class PathCreator(QtWidgets.QMainWindow):
@@ -62,7 +62,7 @@ class PathCreator(QtWidgets.QMainWindow):
         self.setup_ui()
 
         # Map variables
-        self.pixmap_item = None
+        self.map_item = None
         self.map_data = None
         # path data
         self.path_data = PathData()
@@ -373,22 +373,7 @@ class PathCreator(QtWidgets.QMainWindow):
         """
         self.map_data = RosMapData(path)
         self.path_data.map_path = path
-        pixmap = QtGui.QPixmap(self.map_data.image_path)
-        transform = QtGui.QTransform.fromScale(1.0, -1.0)  # flip y axis
-        pixmap = pixmap.transformed(transform)
-
-        # remove old map
-        if self.pixmap_item != None:
-            self.scene.removeItem(self.pixmap_item)
-
-        self.pixmap_item = QtWidgets.QGraphicsPixmapItem(pixmap)
-        self.pixmap_item.setZValue(-1.0)  # make sure map is always in the background
-        self.pixmap_item.setScale(self.map_data.resolution)
-        self.pixmap_item.setOffset(
-            self.map_data.origin[0] / self.map_data.resolution,
-            self.map_data.origin[1] / self.map_data.resolution,
-        )
-        self.scene.addItem(self.pixmap_item)
+        self.map_item = replace_map_item(self.scene, self.map_item, self.map_data)
 
         # update label
         self.map_name_label.setText(pathlib.Path(path).parts[-2])
@@ -1,6 +1,7 @@
 import numpy as np
+import operator
 from enum import Enum
-from FlatlandModel import FlatlandModel
+from FlatlandModel import FlatlandModel, load_flatland_model
 from HelperFunctions import *
 
 class PedsimStartupMode(Enum):
@@ -37,217 +38,155 @@ class PedsimInteractiveObstacle():
 
 
 
+# kinds of pedsim agent fields that need special treatment
+POSITION = "position"  # 2D numpy array
+WAYPOINTS = "waypoints"  # list of 2D numpy arrays
+MODEL_PATH = "model_path"  # path to a flatland model file
+
+
+# fields of a PedsimAgent: (name, kind, default value), derived from pedsim_msgs/Ped.msg
+# __slots__, __eq__, toDict, fromDict and getPedMsg are generated from this list, the order is the order of the dict keys
+PEDSIM_AGENT_FIELDS = [
+    ("name", str, ""),
+    ("id", int, 0),
+    ("pos", POSITION, (0.0, 0.0)),
+    ("type", str, "adult"),
+    ("yaml_file", MODEL_PATH, ""),
+    ("number_of_peds", int, 1),
+    ("vmax", float, 0.3),
+
+    ("start_up_mode", str, "default"),
+    ("wait_time", float, 0.0),
+    ("trigger_zone_radius", float, 0.0),
+
+    ("chatting_probability", float, 0.0),
+    ("tell_story_probability", float, 0.0),
+    ("group_talking_probability", float, 0.0),
+    ("talking_and_walking_probability", float, 0.0),
+    ("requesting_service_probability", float, 0.0),
+    ("requesting_guide_probability", float, 0.0),
+    ("requesting_follower_probability", float, 0.0),
+
+    ("max_talking_distance", float, 5.0),
+    ("max_servicing_radius", float, 5.0),
+
+    ("talking_base_time", float, 10.0),
+    ("tell_story_base_time", float, 0.0),
+    ("group_talking_base_time", float, 10.0),
+    ("talking_and_walking_base_time", float, 6.0),
+    ("receiving_service_base_time", float, 20.0),
+    ("requesting_service_base_time", float, 30.0),
+
+    ("force_factor_desired", float, 1.0),
+    ("force_factor_obstacle", float, 1.0),
+    ("force_factor_social", float, 5.0),
+    ("force_factor_robot", float, 0.0),
+
+    ("waypoints", WAYPOINTS, ()),
+    ("waypoint_mode", int, 0),
+]
+
+
+def _position_to_list(pos) -> list:
+    return [float(pos[0]), float(pos[1])]
+
+
+def _waypoints_to_list(waypoints) -> list:
+    return [[float(wp[0]), float(wp[1])] for wp in waypoints]
+
+
+def _unchanged(value):
+    return value
+
+
+# converters used by PedsimAgent.toDict, values set by widgets might be numpy scalars which can't be dumped to yaml
+_TO_DICT_CONVERTERS = {POSITION: _position_to_list, WAYPOINTS: _waypoints_to_list, float: float, int: int}
+PEDSIM_AGENT_FIELD_NAMES = [name for name, _, _ in PEDSIM_AGENT_FIELDS]
+_get_field_values = operator.attrgetter(*PEDSIM_AGENT_FIELD_NAMES)
+_field_converters = [_TO_DICT_CONVERTERS.get(kind, _unchanged) for _, kind, _ in PEDSIM_AGENT_FIELDS]
+
+
+def is_close(a: float, b: float) -> bool:
+    '''
+    Same as np.allclose(a, b) for two scalars, but without the overhead of creating arrays.
+    '''
+    return a == b or abs(a - b) <= 1e-8 + 1e-5 * abs(b)
+
+
+def are_close(a, b) -> bool:
+    '''
+    Same as np.allclose(a, b) for two vectors of the same length.
+    '''
+    return len(a) == len(b) and all(is_close(float(x), float(y)) for x, y in zip(a, b))
+
+
 class PedsimAgent():
+    __slots__ = PEDSIM_AGENT_FIELD_NAMES + ["flatlandModel"]
+
     def __init__(self, name = "", flatlandModelPath = "") -> None:
+        # set default values
+        for field_name, kind, default in PEDSIM_AGENT_FIELDS:
+            if kind == POSITION:
+                setattr(self, field_name, np.array(default, dtype=float))
+            elif kind == WAYPOINTS:
+                setattr(self, field_name, [])
+            else:
+                setattr(self, field_name, default)
         self.name = name
-
-        # set default values (derived from pedsim_msgs/Ped.msg)
-        self.id = 0
-        self.pos = np.zeros(2)
-        self.type = "adult"
-        self.yaml_file = ""
         self.flatlandModel = None  # FlatlandModel instance
         if flatlandModelPath != "":
             self.loadFlatlandModel(flatlandModelPath)
-        self.number_of_peds = 1
-        self.vmax = 0.3 
-
-        self.start_up_mode = "default"
-        self.wait_time = 0.0
-        self.trigger_zone_radius = 0.0
-
-        self.max_talking_distance = 5.0
-        self.max_servicing_radius = 5.0
-
-        self.chatting_probability = 0.0
-        self.tell_story_probability = 0.0
-        self.group_talking_probability = 0.0
-        self.talking_and_walking_probability = 0.0
-        self.requesting_service_probability = 0.0
-        self.requesting_guide_probability = 0.0
-        self.requesting_follower_probability = 0.0
-
-        self.talking_base_time = 10.0
-        self.tell_story_base_time = 0.0
-        self.group_talking_base_time = 10.0
-        self.talking_and_walking_base_time = 6.0
-        self.receiving_service_base_time = 20.0
-        self.requesting_service_base_time = 30.0
-
-        self.force_factor_desired = 1.0
-        self.force_factor_obstacle = 1.0
-        self.force_factor_social = 5.0
-        self.force_factor_robot = 0.0
-
-        self.waypoints = []  # list of 2D numpy arrays
-        self.waypoint_mode = 0
 
     def loadFlatlandModel(self, path: str):
         self.yaml_file = path
-        model = FlatlandModel()
-        model.load(path)
-        self.flatlandModel = model
+        self.flatlandModel = load_flatland_model(path)
 
     def __eq__(self, other):
         if not isinstance(other, PedsimAgent):
             return NotImplemented
 
-        if self.name != other.name:
-            return False
-        if self.flatlandModel != other.flatlandModel:
-            return False
+        for field_name, kind, _ in PEDSIM_AGENT_FIELDS:
+            a = getattr(self, field_name)
+            b = getattr(other, field_name)
+            if kind == float:
+                if not is_close(a, b):
+                    return False
+            elif kind == POSITION:
+                if not are_close(a, b):
+                    return False
+            elif kind == WAYPOINTS:
+                if len(a) != len(b) or not all(are_close(wpa, wpb) for wpa, wpb in zip(a, b)):
+                    return False
+            elif a != b:
+                return False
 
-        if self.id != other.id:
-            return False
-        if not np.allclose(self.pos, other.pos):
-            return False
-        if self.type != other.type:
-            return False
-        if self.yaml_file != other.yaml_file:
-            return False
-        if self.number_of_peds != other.number_of_peds:
-            return False
-        if not np.allclose(self.vmax, other.vmax):
-            return False
-        if self.start_up_mode != other.start_up_mode:
-            return False
-        if not np.allclose(self.wait_time, other.wait_time):
-            return False
-        if not np.allclose(self.trigger_zone_radius, other.trigger_zone_radius):
-            return False
-        if not np.allclose(self.chatting_probability, other.chatting_probability):
-            return False
-        if not np.allclose(self.tell_story_probability, other.tell_story_probability):
-            return False
-        if not np.allclose(self.group_talking_probability, other.group_talking_probability):
-            return False
-        if not np.allclose(self.talking_and_walking_probability, other.talking_and_walking_probability):
-            return False
-        if not np.allclose(self.requesting_service_probability, other.requesting_service_probability):
-            return False
-        if not np.allclose(self.requesting_guide_probability, other.requesting_guide_probability):
-            return False
-        if not np.allclose(self.requesting_follower_probability, other.requesting_follower_probability):
-            return False
-        if not np.allclose(self.max_talking_distance, other.max_talking_distance):
-            return False
-        if not np.allclose(self.max_servicing_radius, other.max_servicing_radius):
-            return False
-        if not np.allclose(self.talking_base_time, other.talking_base_time):
-            return False
-        if not np.allclose(self.tell_story_base_time, other.tell_story_base_time):
-            return False
-        if not np.allclose(self.group_talking_base_time, other.group_talking_base_time):
-            return False
-        if not np.allclose(self.talking_and_walking_base_time, other.talking_and_walking_base_time):
-            return False
-        if not np.allclose(self.receiving_service_base_time, other.receiving_service_base_time):
-            return False
-        if not np.allclose(self.requesting_service_base_time, other.requesting_service_base_time):
-            return False
-        if not np.allclose(self.force_factor_desired, other.force_factor_desired):
-            return False
-        if not np.allclose(self.force_factor_obstacle, other.force_factor_obstacle):
-            return False
-        if not np.allclose(self.force_factor_social, other.force_factor_social):
-            return False
-        if not np.allclose(self.force_factor_robot, other.force_factor_robot):
-            return False
-        if len(self.waypoints) != len(other.waypoints):
-            return False
-        if not np.all([np.allclose(wpa, wpb) for wpa, wpb in zip(self.waypoints, other.waypoints)]):
-            return False
-        if self.waypoint_mode != other.waypoint_mode:
+        if self.flatlandModel != other.flatlandModel:
             return False
 
         return True
 
     def toDict(self):
-        d = {}
-
-        d["name"] = self.name
-        
-        d["id"] = self.id
-        d["pos"] = [float(val) for val in self.pos]
-        d["type"] = self.type
-        d["yaml_file"] = self.yaml_file
-        d["number_of_peds"] = self.number_of_peds
-        d["vmax"] = self.vmax
-
-        d["start_up_mode"] = self.start_up_mode
-        d["wait_time"] = self.wait_time
-        d["trigger_zone_radius"] = self.trigger_zone_radius
-
-        d["chatting_probability"] = self.chatting_probability
-        d["tell_story_probability"] = self.tell_story_probability
-        d["group_talking_probability"] = self.group_talking_probability
-        d["talking_and_walking_probability"] = self.talking_and_walking_probability
-        d["requesting_service_probability"] = self.requesting_service_probability
-        d["requesting_guide_probability"] = self.requesting_guide_probability
-        d["requesting_follower_probability"] = self.requesting_follower_probability
-
-        d["max_talking_distance"] = self.max_talking_distance
-        d["max_servicing_radius"] = self.max_servicing_radius
-
-        d["talking_base_time"] = self.talking_base_time
-        d["tell_story_base_time"] = self.tell_story_base_time
-        d["group_talking_base_time"] = self.group_talking_base_time
-        d["talking_and_walking_base_time"] = self.talking_and_walking_base_time
-        d["receiving_service_base_time"] = self.receiving_service_base_time
-        d["requesting_service_base_time"] = self.requesting_service_base_time
-
-        d["force_factor_desired"] = self.force_factor_desired
-        d["force_factor_obstacle"] = self.force_factor_obstacle
-        d["force_factor_social"] = self.force_factor_social
-        d["force_factor_robot"] = self.force_factor_robot
-
-        d["waypoints"] = [[float(val) for val in wp] for wp in self.waypoints]
-        d["waypoint_mode"] = self.waypoint_mode
-
-        return d
+        return {field_name: convert(value) for field_name, convert, value
+                in zip(PEDSIM_AGENT_FIELD_NAMES, _field_converters, _get_field_values(self))}
 
     @staticmethod
-    def fromDict(d : dict):
-        a = PedsimAgent(d["name"], d["yaml_file"])
-
-        a.name = d["name"]
-    
-        a.id = d["id"]
-        a.pos = np.array([d["pos"][0], d["pos"][1]])
-        a.type = d["type"]
-        a.yaml_file = get_current_user_path(d["yaml_file"])
-        a.number_of_peds = d["number_of_peds"]
-        a.vmax = d["vmax"]
-
-        a.start_up_mode = d["start_up_mode"]
-        a.wait_time = d["wait_time"]
-        a.trigger_zone_radius = d["trigger_zone_radius"]
-
-        a.chatting_probability = d["chatting_probability"]
-        a.tell_story_probability = d["tell_story_probability"]
-        a.group_talking_probability = d["group_talking_probability"]
-        a.talking_and_walking_probability = d["talking_and_walking_probability"]
-        a.requesting_service_probability = d["requesting_service_probability"]
-        a.requesting_guide_probability = d["requesting_guide_probability"]
-        a.requesting_follower_probability = d["requesting_follower_probability"]
-
-        a.max_talking_distance = d["max_talking_distance"]
-        a.max_servicing_radius = d["max_servicing_radius"]
-
-        a.talking_base_time = d["talking_base_time"]
-        a.tell_story_base_time = d["tell_story_base_time"]
-        a.group_talking_base_time = d["group_talking_base_time"]
-        a.talking_and_walking_base_time = d["talking_and_walking_base_time"]
-        a.receiving_service_base_time = d["receiving_service_base_time"]
-        a.requesting_service_base_time = d["requesting_service_base_time"]
-
-        a.force_factor_desired = d["force_factor_desired"]
-        a.force_factor_obstacle = d["force_factor_obstacle"]
-        a.force_factor_social = d["force_factor_social"]
-        a.force_factor_robot = d["force_factor_robot"]
-
-        a.waypoints = [np.array([wp[0], wp[1]]) for wp in d["waypoints"]]
-        a.waypoint_mode = int(d["waypoint_mode"])
+    def fromDict(d : dict, convert_paths: bool = True):
+        '''
+        - convert_paths: convert the model path to the current user (see get_current_user_path())
+        '''
+        yaml_file = get_current_user_path(d["yaml_file"]) if convert_paths else d["yaml_file"]
+        a = PedsimAgent(d["name"], yaml_file)
+
+        for field_name, kind, _ in PEDSIM_AGENT_FIELDS:
+            if field_name not in d or kind == MODEL_PATH:
+                continue
+            value = d[field_name]
+            if kind == POSITION:
+                setattr(a, field_name, np.array([float(value[0]), float(value[1])]))
+            elif kind == WAYPOINTS:
+                setattr(a, field_name, [np.array([float(wp[0]), float(wp[1])]) for wp in value])
+            else:
+                setattr(a, field_name, kind(value))
 
         return a
 
@@ -260,41 +199,15 @@ class PedsimAgent():
 
         msg = Ped()
 
-        msg.id = self.id
-        msg.pos = Point(self.pos[0], self.pos[1], 0)
-        msg.type = self.type
-        msg.yaml_file = self.yaml_file
-        msg.number_of_peds = self.number_of_peds
-        msg.vmax = self.vmax
-
-        msg.start_up_mode = self.start_up_mode
-        msg.wait_time = self.wait_time
-        msg.trigger_zone_radius = self.trigger_zone_radius
-
-        msg.chatting_probability = self.chatting_probability
-        msg.tell_story_probability = self.tell_story_probability
-        msg.group_talking_probability = self.group_talking_probability
-        msg.talking_and_walking_probability = self.talking_and_walking_probability
-        msg.requesting_service_probability = self.requesting_service_probability
-        msg.requesting_guide_probability = self.requesting_guide_probability
-        msg.requesting_follower_probability = self.requesting_follower_probability
-
-        msg.max_talking_distance = self.max_talking_distance
-        msg.max_servicing_radius = self.max_servicing_radius
-
-        msg.talking_base_time = self.talking_base_time
-        msg.tell_story_base_time = self.tell_story_base_time
-        msg.group_talking_base_time = self.group_talking_base_time
-        msg.talking_and_walking_base_time = self.talking_and_walking_base_time
-        msg.receiving_service_base_time = self.receiving_service_base_time
-        msg.requesting_service_base_time = self.requesting_service_base_time
-
-        msg.force_factor_desired = self.force_factor_desired
-        msg.force_factor_obstacle = self.force_factor_obstacle
-        msg.force_factor_social = self.force_factor_social
-        msg.force_factor_robot = self.force_factor_robot
-
-        msg.waypoints = [Point(wp[0], wp[1], 0) for wp in self.waypoints]
-        msg.waypoint_mode = self.waypoint_mode
+        for field_name, kind, _ in PEDSIM_AGENT_FIELDS:
+            if field_name == "name":
+                # not part of the message
+                continue
+            value = getattr(self, field_name)
+            if kind == POSITION:
+                value = Point(value[0], value[1], 0)
+            elif kind == WAYPOINTS:
+                value = [Point(wp[0], wp[1], 0) for wp in value]
+            setattr(msg, field_name, value)
 
         return msg
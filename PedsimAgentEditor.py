@@ -9,17 +9,18 @@ from HelperFunctions import *
 class PedsimAgentEditor(QtWidgets.QWidget):
     editorSaved = QtCore.pyqtSignal()
 
-    def __init__(self, pedsimAgentWidget = None, **kwargs):
+    def __init__(self, pedsimAgentElement = None, **kwargs):
         super().__init__(**kwargs)
-        self.pedsimAgentWidget = pedsimAgentWidget
-        if pedsimAgentWidget == None:
+        self.pedsimAgentElement = pedsimAgentElement
+        if pedsimAgentElement == None:
             self.pedsimAgent = PedsimAgent()
             if get_ros_package_path("simulator_setup") != "":
                 path = os.path.join(get_ros_package_path("simulator_setup"), "dynamic_obstacles", "person_two_legged.model.yaml")
                 self.pedsimAgent.loadFlatlandModel(path)
         else:
-            self.pedsimAgent = pedsimAgentWidget.pedsimAgent
+            self.pedsimAgent = pedsimAgentElement.pedsimAgent
         self.tempFlatlandModel = FlatlandModel()
+        self.tempFlatlandModelPath = ""  # shared models keep the path they were first loaded with
         self.setup_ui()
         self.updateValuesFromPedsimAgent()
         self.updateWidgetsFromSelectedType()
@@ -60,7 +61,7 @@ class PedsimAgentEditor(QtWidgets.QWidget):
         self.nameLabel.setTextFormat(QtCore.Qt.TextFormat.MarkdownText)
         self.scrollAreaFrame.layout().addWidget(self.nameLabel, vertical_idx, 0, QtCore.Qt.AlignmentFlag.AlignLeft)
         ## editbox
-        name = self.pedsimAgentWidget.name_label.text() if self.pedsimAgentWidget != None else "global agent"
+        name = self.pedsimAgentElement.pedsimAgent.name if self.pedsimAgentElement != None else "global agent"
         self.name_edit = QtWidgets.QLineEdit(name)
         self.name_edit.setFixedSize(200, 30)
         self.scrollAreaFrame.layout().addWidget(self.name_edit, vertical_idx, 1, QtCore.Qt.AlignmentFlag.AlignRight)
@@ -553,6 +554,7 @@ class PedsimAgentEditor(QtWidgets.QWidget):
             self.requestingFollowerProbabilitySlider.hide()
 
     def updateValuesFromPedsimAgent(self):
+        self.resetModelFromPedsimAgent()
         self.setModelPath(self.pedsimAgent.yaml_file)
 
         self.typeComboBox.setCurrentIndex(PedsimAgentType[self.pedsimAgent.type.upper()].value)
@@ -589,6 +591,20 @@ class PedsimAgentEditor(QtWidgets.QWidget):
 
         self.name_edit.setText(self.pedsimAgent.name)
 
+    def setPedsimAgentElement(self, pedsimAgentElement):
+        '''
+        Edit the agent of another element, so one editor can be reused for all agents.
+        '''
+        self.pedsimAgentElement = pedsimAgentElement
+        self.pedsimAgent = pedsimAgentElement.pedsimAgent
+        self.resetModelFromPedsimAgent()
+
+    def resetModelFromPedsimAgent(self):
+        # don't keep the model chosen for the previous agent if the model file of this agent doesn't exist
+        self.tempFlatlandModel = self.pedsimAgent.flatlandModel
+        self.tempFlatlandModelPath = self.pedsimAgent.yaml_file
+        self.modelButton.setText("Choose...")
+
     def show(self):
         self.updateValuesFromPedsimAgent()
         return super().show()
@@ -602,7 +618,8 @@ class PedsimAgentEditor(QtWidgets.QWidget):
 
     def setModelPath(self, path: str):
         if os.path.exists(path):
-            self.tempFlatlandModel.load(path)
+            self.tempFlatlandModel = load_flatland_model(path)
+            self.tempFlatlandModelPath = path
             self.modelButton.setText(path.split("/")[-1])
 
     def updatePedsimAgentFromWidgets(self, agent: PedsimAgent):
@@ -638,7 +655,7 @@ class PedsimAgentEditor(QtWidgets.QWidget):
 
         agent.waypoint_mode = PedsimWaypointMode(self.waypointModeComboBox.currentIndex()).value
 
-        agent.yaml_file = self.tempFlatlandModel.path
+        agent.yaml_file = self.tempFlatlandModelPath
 
         agent.name = self.name_edit.text()
         agent.flatlandModel = self.tempFlatlandModel
@@ -671,7 +688,7 @@ class PedsimAgentEditor(QtWidgets.QWidget):
 class PedsimAgentEditorGlobalConfig(PedsimAgentEditor):
     """
     A Pedsim Agent Editor excluding widgets that shouldn't be globally configured
-    and without a parent PedsimAgentWidget.
+    and without a parent PedsimAgentElement.
     """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -0,0 +1,177 @@
+import numpy as np
+from typing import List
+from PedsimAgent import *
+
+
+class PedsimAgentTable():
+    '''
+    Columnar store for a large number of pedsim agents.
+    Every numeric field of PEDSIM_AGENT_FIELDS is kept in its own contiguous numpy array, positions in an (n, 2) array
+    and the waypoints of all agents in one (m, 2) array, where the waypoints of agent i are
+    waypoint_coords[waypoint_offsets[i]:waypoint_offsets[i + 1]].
+    Strings that are shared by many agents (type, start up mode, model file) are stored as codes into a list of values.
+    Bulk edits become vectorized operations, e.g.:
+        table["vmax"] *= 1.2
+        table.shift([1.0, 0.0])
+    '''
+    # string fields stored as codes into a list of unique values
+    CATEGORICAL_KINDS = [str, MODEL_PATH]
+
+    def __init__(self, number_of_agents: int = 0):
+        n = number_of_agents
+        self.names = [""] * n
+        self.columns = {}  # key: field name, value: numpy array with one entry per agent
+        self.categories = {}  # key: field name, value: list of values the codes in self.columns refer to
+        for field_name, kind, default in PEDSIM_AGENT_FIELDS:
+            if field_name == "name":
+                continue
+            if kind == POSITION:
+                self.columns[field_name] = np.tile(np.array(default, dtype=np.float64), (n, 1))
+            elif kind == WAYPOINTS:
+                self.waypoint_offsets = np.zeros(n + 1, dtype=np.int64)
+                self.waypoint_coords = np.zeros((0, 2), dtype=np.float64)
+            elif kind in self.CATEGORICAL_KINDS:
+                self.categories[field_name] = [default]
+                self.columns[field_name] = np.zeros(n, dtype=np.int32)
+            else:
+                self.columns[field_name] = np.full(n, default, dtype=np.float64 if kind == float else np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, field_name: str) -> np.ndarray:
+        '''
+        Return the column of a numeric field, e.g. table["vmax"] or table["pos"]. Changes to the array change the table.
+        '''
+        if field_name in self.categories:
+            raise KeyError(f"'{field_name}' is a string field, use getValues() or setValue() instead.")
+        return self.columns[field_name]
+
+    def __setitem__(self, field_name: str, values):
+        '''
+        Set the column of a numeric field, e.g. table["vmax"] = 0.5. Also makes table["vmax"] *= 1.2 work.
+        '''
+        self[field_name][...] = values
+
+    def getValues(self, field_name: str) -> list:
+        '''
+        Return the values of a string field for all agents.
+        '''
+        if field_name == "name":
+            return list(self.names)
+        values = self.categories[field_name]
+        return [values[code] for code in self.columns[field_name].tolist()]
+
+    def setValue(self, field_name: str, value: str, indices=slice(None)):
+        '''
+        Set a string field of the agents at indices (all agents by default) to value.
+        '''
+        if field_name == "name":
+            for i in range(len(self))[indices] if isinstance(indices, slice) else indices:
+                self.names[i] = value
+            return
+        values = self.categories[field_name]
+        if value not in values:
+            values.append(value)
+        self.columns[field_name][indices] = values.index(value)
+
+    def getWaypoints(self, index: int) -> np.ndarray:
+        '''
+        Return the waypoints of the agent at index as an (k, 2) view into the table.
+        '''
+        return self.waypoint_coords[self.waypoint_offsets[index]:self.waypoint_offsets[index + 1]]
+
+    def getWaypointCounts(self) -> np.ndarray:
+        return np.diff(self.waypoint_offsets)
+
+    def shift(self, offset):
+        '''
+        Move all agents and their waypoints by offset (x, y).
+        '''
+        offset = np.asarray(offset, dtype=np.float64)
+        self.columns["pos"] += offset
+        self.waypoint_coords += offset
+
+    def _setWaypoints(self, waypoint_lists: list):
+        counts = np.fromiter((len(wps) for wps in waypoint_lists), dtype=np.int64, count=len(waypoint_lists))
+        self.waypoint_offsets = np.zeros(len(waypoint_lists) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.waypoint_offsets[1:])
+        coords = [wp for wps in waypoint_lists for wp in wps]
+        self.waypoint_coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+
+    @staticmethod
+    def fromDicts(dicts: List[dict], convert_paths: bool = True):
+        '''
+        Create a table from agent dictionaries as returned by PedsimAgent.toDict(),
+        without creating a PedsimAgent object for each agent.
+        - convert_paths: convert model paths to the current user like PedsimAgent.fromDict() does
+        '''
+        table = PedsimAgentTable(len(dicts))
+        n = len(dicts)
+        table.names = [d["name"] for d in dicts]
+        for field_name, kind, default in PEDSIM_AGENT_FIELDS:
+            if field_name == "name":
+                continue
+            values = [d.get(field_name, default) for d in dicts]
+            if kind == POSITION:
+                table.columns[field_name] = np.array(values, dtype=np.float64).reshape(n, 2)
+            elif kind == WAYPOINTS:
+                table._setWaypoints(values)
+            elif kind in PedsimAgentTable.CATEGORICAL_KINDS:
+                categories = {}
+                codes = np.fromiter((categories.setdefault(value, len(categories)) for value in values),
+                                    dtype=np.int32, count=n)
+                if kind == MODEL_PATH and convert_paths:
+                    # convert every distinct path only once
+                    table.categories[field_name] = [get_current_user_path(value) for value in categories]
+                else:
+                    table.categories[field_name] = list(categories)
+                table.columns[field_name] = codes
+            else:
+                table.columns[field_name] = np.array(values, dtype=table.columns[field_name].dtype)
+        return table
+
+    def toDicts(self) -> List[dict]:
+        '''
+        Return all agents as dictionaries in the same format as PedsimAgent.toDict().
+        '''
+        columns = []
+        for field_name, kind, _ in PEDSIM_AGENT_FIELDS:
+            if field_name == "name":
+                columns.append(self.names)
+            elif kind == WAYPOINTS:
+                coords = self.waypoint_coords.tolist()
+                offsets = self.waypoint_offsets.tolist()
+                columns.append([coords[offsets[i]:offsets[i + 1]] for i in range(len(self))])
+            elif field_name in self.categories:
+                columns.append(self.getValues(field_name))
+            else:
+                # tolist() converts to plain python floats and ints
+                columns.append(self.columns[field_name].tolist())
+        return [dict(zip(PEDSIM_AGENT_FIELD_NAMES, values)) for values in zip(*columns)]
+
+    @staticmethod
+    def fromAgents(agents: List[PedsimAgent]):
+        return PedsimAgentTable.fromDicts([agent.toDict() for agent in agents], convert_paths=False)
+
+    def getAgent(self, index: int) -> PedsimAgent:
+        '''
+        Create a PedsimAgent object for the agent at index. Changes to the object don't change the table.
+        '''
+        agent = PedsimAgent(self.names[index], self.categories["yaml_file"][self.columns["yaml_file"][index]])
+        for field_name, kind, _ in PEDSIM_AGENT_FIELDS:
+            if field_name == "name" or kind == MODEL_PATH:
+                continue
+            if kind == POSITION:
+                value = self.columns[field_name][index].copy()
+            elif kind == WAYPOINTS:
+                value = list(self.getWaypoints(index).copy())
+            elif field_name in self.categories:
+                value = self.categories[field_name][self.columns[field_name][index]]
+            else:
+                value = self.columns[field_name][index].item()
+            setattr(agent, field_name, value)
+        return agent
+
+    def toAgents(self) -> List[PedsimAgent]:
+        return [self.getAgent(i) for i in range(len(self))]
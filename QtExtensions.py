@@ -1,5 +1,10 @@
 from PyQt5 import QtGui, QtCore, QtWidgets
 import numpy as np
+import collections
+import contextlib
+import json
+import math
+import os
 from HelperFunctions import *
 
 class KeyPressEater(QtCore.QObject):
@@ -22,17 +27,19 @@ class KeyPressEater(QtCore.QObject):
 
 class ArenaGraphicsPathItem(QtWidgets.QGraphicsPathItem):
     '''
-    A QGraphicsPathItem that is connected to a QGraphicsScene and two QDoubleSpinBoxes
-    that hold the position of this item.
+    A QGraphicsPathItem that belongs to an element of the scenario editor (e.g. PedsimAgentElement).
+    The element is notified when the item is moved, rotated, double clicked or removed.
     '''
 
-    def __init__(self, parentWidget, *args, **kwargs):
+    def __init__(self, element, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.parentWidget = parentWidget
+        self.element = element
         self.setFlags(
             QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsSelectable |
             QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges
             )
+        # render into a cached pixmap, moving the item then only needs to copy the pixmap
+        self.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
         self.isDragged = False
 
@@ -51,12 +58,10 @@ class ArenaGraphicsPathItem(QtWidgets.QGraphicsPathItem):
         self.textItem = QtWidgets.QGraphicsTextItem("")
         self.textItem.setZValue(5)  # place text item above everything else
         self.textItem.setScale(0.035)
-        parentWidget.graphicsScene.addItem(self.textItem)
+        self.textItem.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        element.graphicsScene.addItem(self.textItem)
         self.updateTextItemPos()
 
-        # catch key presses for interacting with the item in the scene
-        self.keyPressEater = KeyPressEater(self.handleEvent)
-        
         self.oldItemPos = self.scenePos()
 
     # Alternative version of updateTextItemPos().
@@ -88,10 +93,16 @@ class ArenaGraphicsPathItem(QtWidgets.QGraphicsPathItem):
         super().setPos(x, y)
         self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, True)
 
+    def setRotationNoEvent(self, angle):
+        self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, False)
+        super().setRotation(angle)
+        self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, True)
+
     def itemChange(self, change, value):
-        if change == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemPositionChange:
+        if (change == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged
+            or change == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemRotationHasChanged):
             self.updateTextItemPos()
-            self.parentWidget.handleItemChange()
+            self.element.graphicsScene.callAfterBulkUpdate(self.element.handleItemChange)
 
         return super().itemChange(change, value)
 
@@ -137,20 +148,11 @@ class ArenaGraphicsPathItem(QtWidgets.QGraphicsPathItem):
         return super().mouseReleaseEvent(mouse_event)
 
     def mouseDoubleClickEvent(self, mouse_event):
-        self.parentWidget.handleMouseDoubleClick()
-
-    def handleEvent(self, event):
-        # delete item when selected and DELETE key pressed
-        if (event.type() == QtCore.QEvent.Type.KeyRelease
-            and event.key() == QtCore.Qt.Key.Key_Delete
-            and self.isSelected()):
-            self.remove()
-
-        # return false so event is not consumed and can be handled by other items aswell
-        return False
+        self.element.handleMouseDoubleClick()
 
     def remove(self):
-        self.parentWidget.remove()
+        # called by ArenaQGraphicsScene when the item is selected and DELETE is pressed
+        self.element.remove()
 
 
 
@@ -173,6 +175,7 @@ class ArenaGraphicsEllipseItem(QtWidgets.QGraphicsEllipseItem):
             QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsSelectable |
             QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges
             )
+        self.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self.isDragged = False
 
         # set brush
@@ -274,40 +277,30 @@ class ArenaGraphicsEllipseItem(QtWidgets.QGraphicsEllipseItem):
 
 class WaypointGraphicsEllipseItem(ArenaGraphicsEllipseItem):
     '''
-    This item is meant to visualize a waypoint and is connected to a parent WaypointWidget.
+    This item is meant to visualize a waypoint and is connected to a parent PedsimAgentElement.
     '''
-    def __init__(self, waypointWidget, *args, **kwargs):
+    def __init__(self, pedsimAgentElement, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.waypointWidget = waypointWidget
+        self.pedsimAgentElement = pedsimAgentElement
 
         # set color
         brush = QtGui.QBrush(QtGui.QColor("blue"), QtCore.Qt.BrushStyle.SolidPattern)
         self.setBrush(brush)
 
-        self.keyPressEater = KeyPressEater(self.handleEvent)
-
     def setPosNoEvent(self, x, y):
         super().setPosNoEvent(x, y)
-        self.waypointWidget.pedsimAgentWidget.drawWaypointPath()
+        # path is drawn once if many waypoints are moved in a bulk update
+        self.pedsimAgentElement.graphicsScene.callAfterBulkUpdate(self.pedsimAgentElement.drawWaypointPath)
 
     def itemChange(self, change, value):
-        if change == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemPositionChange:
-            self.waypointWidget.updateSpinBoxesFromGraphicsItem()
-            self.waypointWidget.pedsimAgentWidget.drawWaypointPath()
+        if change == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged and self.scene() is not None:
+            self.pedsimAgentElement.graphicsScene.callAfterBulkUpdate(self.pedsimAgentElement.handleWaypointItemChange, self)
 
         return super().itemChange(change, value)
 
-    def handleEvent(self, event):
-        if (event.type() == QtCore.QEvent.Type.KeyRelease
-            and event.key() == QtCore.Qt.Key.Key_Delete
-            and self.isSelected()):
-            self.remove()
-            return True
-
-        return False
-
     def remove(self):
-        self.waypointWidget.remove()
+        # called by ArenaQGraphicsScene when the item is selected and DELETE is pressed
+        self.pedsimAgentElement.removeWaypoint(self)
 
 
 class SubgoalEllipseItem(ArenaGraphicsEllipseItem):
@@ -494,7 +487,7 @@ class ActiveModeWindow(QtWidgets.QMessageBox):
         return super().closeEvent(event)
 
     def disable(self):
-        self.connectedWidget.addWaypointModeActive = False
+        self.connectedWidget.setAddWaypointMode(False)
         self.hide()
 
 
@@ -659,18 +652,363 @@ class ArenaQDoubleSpinBox(QtWidgets.QDoubleSpinBox):
         self.setValue(new_value)
 
 
+def set_spin_box_values_no_signal(spin_boxes: list, values: list):
+    '''
+    Set the values of spin boxes without emitting valueChanged,
+    e.g. for spin boxes showing the position of a graphics item that was just moved.
+    '''
+    for spin_box, value in zip(spin_boxes, values):
+        spin_box.blockSignals(True)
+        spin_box.setValue(value)
+        spin_box.blockSignals(False)
+
+
 
 class ArenaQGraphicsScene(QtWidgets.QGraphicsScene):
+    MIN_BSP_TREE_DEPTH = 5
+    MAX_BSP_TREE_DEPTH = 16
+    ITEMS_PER_BSP_TREE_LEAF = 8
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # one event filter for all items of the scene, so handling an event doesn't get slower with every item
+        self.keyPressEater = KeyPressEater(self.handleEvent, parent=self)
+        self.bulkIndexUpdateLevel = 0  # nesting level of bulkIndexUpdate()
+        self.bulkUpdateLevel = 0  # nesting level of bulkUpdate()
+        self.bulkUpdateCalls = {}  # calls deferred by callAfterBulkUpdate(), key: (function, args), value: None
+
+    def rebuildIndex(self):
+        '''
+        Choose the depth of the BSP tree index from the current number of items and rebuild the index if it changed.
+        Qt only chooses the depth when the index is created, e.g. while the scene is still empty,
+        so hit-testing and rubber band selection would get slow with many items.
+        '''
+        leaves = max(len(self.items()) / self.ITEMS_PER_BSP_TREE_LEAF, 1.0)
+        depth = min(max(math.ceil(math.log2(leaves)), self.MIN_BSP_TREE_DEPTH), self.MAX_BSP_TREE_DEPTH)
+        if depth != self.bspTreeDepth():
+            self.setBspTreeDepth(depth)
+
+    @contextlib.contextmanager
+    def bulkIndexUpdate(self):
+        '''
+        Don't update the item index while many items are added, moved or removed.
+        The index is rebuilt once at the end. Can be nested.
+        '''
+        self.bulkIndexUpdateLevel += 1
+        if self.bulkIndexUpdateLevel == 1:
+            self.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
+        try:
+            yield
+        finally:
+            self.bulkIndexUpdateLevel -= 1
+            if self.bulkIndexUpdateLevel == 0:
+                self.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+                self.rebuildIndex()
+
+    @contextlib.contextmanager
+    def bulkUpdate(self):
+        '''
+        Add, move or remove many items at once. Until the end of the outermost bulkUpdate():
+        - the item index is not updated (see bulkIndexUpdate())
+        - signals of the scene are blocked, selectionChanged is emitted once at the end
+        - items don't notify their elements of changes directly, see callAfterBulkUpdate()
+        - views are not repainted, the whole scene is repainted once at the end
+        '''
+        if self.bulkUpdateLevel > 0:
+            # nested, everything is done by the outermost bulkUpdate()
+            self.bulkUpdateLevel += 1
+            try:
+                yield
+            finally:
+                self.bulkUpdateLevel -= 1
+            return
+
+        signals_blocked = self.blockSignals(True)
+        viewports = [view.viewport() for view in self.views()]
+        for viewport in viewports:
+            viewport.setUpdatesEnabled(False)
+        self.bulkUpdateLevel = 1
+        try:
+            with self.bulkIndexUpdate():
+                try:
+                    yield
+                finally:
+                    self.bulkUpdateLevel = 0
+                    self.flushCallsAfterBulkUpdate()
+        finally:
+            self.blockSignals(signals_blocked)
+            for viewport in viewports:
+                viewport.setUpdatesEnabled(True)
+            self.update()
+            self.selectionChanged.emit()
+
+    def callAfterBulkUpdate(self, function, *args):
+        '''
+        Call function(*args) at the end of the current bulkUpdate(), or right away if there is none.
+        A call that is requested several times during a bulkUpdate() is only made once.
+        '''
+        if self.bulkUpdateLevel > 0:
+            self.bulkUpdateCalls[(function, args)] = None
+        else:
+            function(*args)
+
+    def flushCallsAfterBulkUpdate(self):
+        '''
+        Make the calls deferred by callAfterBulkUpdate() now.
+        Elements call this before they mark their items as in sync with their data,
+        so deferred change notifications of their own updates don't arrive later.
+        '''
+        calls = self.bulkUpdateCalls
+        self.bulkUpdateCalls = {}
+        for function, args in calls:
+            function(*args)
+
+    def handleEvent(self, event):
+        # delete selected items when DELETE key pressed
+        if (event.type() == QtCore.QEvent.Type.KeyRelease
+            and event.key() == QtCore.Qt.Key.Key_Delete):
+            self.removeSelected()
+
+        # return false so event is not consumed and can be handled by others aswell
+        return False
 
     def removeSelected(self):
         for item in self.selectedItems():
-            if isinstance(item, ArenaGraphicsPathItem):
+            # skip items that were already removed together with another item (e.g. waypoints of an agent)
+            if item.scene() is self and isinstance(item, (ArenaGraphicsPathItem, WaypointGraphicsEllipseItem)):
                 item.remove()
 
 
 
+class MapTilePyramid():
+    '''
+    Mipmap pyramid of a map image, split into tiles of TILE_SIZE pixels.
+    Level 0 has the resolution of the image, every further level half the resolution of the previous one.
+    The pyramid of a large image is built once and stored in MAP_TILE_CACHE_FOLDER next to the image,
+    so opening the map again only reads the index and tiles are loaded when they are needed.
+    Smaller images are tiled in memory.
+    '''
+    TILE_SIZE = 512  # pixels
+    VERSION = 1
+    DISK_CACHE_MIN_PIXELS = 4096 * 4096  # images with less pixels are not cached on disk
+    MAP_TILE_CACHE_FOLDER = ".map_tiles"
+    PNG_QUALITY = 50  # faster than the default compression, files are only slightly larger
+
+    def __init__(self, image_path: str):
+        self.image_path = image_path
+        self.levels = []  # list of (width, height) of every level
+        self.folder = None  # folder of the tiles on disk, None if the tiles are kept in memory
+        self.tiles = {}  # key: (level, row, column), value: QImage, only used if the tiles are kept in memory
+        size = QtGui.QImageReader(image_path).size()
+        if size.isValid() and size.width() * size.height() >= self.DISK_CACHE_MIN_PIXELS:
+            self.folder = os.path.join(os.path.dirname(image_path), self.MAP_TILE_CACHE_FOLDER,
+                                       os.path.basename(image_path))
+            if self.loadIndex():
+                return
+        self.build()
+
+    def getIndexPath(self) -> str:
+        return os.path.join(self.folder, "index.json")
+
+    def getTilePath(self, level: int, row: int, column: int) -> str:
+        return os.path.join(self.folder, str(level), f"{row}_{column}.png")
+
+    def getImageStat(self) -> dict:
+        stat = os.stat(self.image_path)
+        return {"version": self.VERSION, "tile_size": self.TILE_SIZE, "image_size": stat.st_size,
+                "image_mtime_ns": stat.st_mtime_ns}
+
+    def loadIndex(self) -> bool:
+        '''
+        Load the levels of a pyramid on disk. Returns False if there is none or it was built from an older image.
+        '''
+        try:
+            with open(self.getIndexPath(), "r") as file:
+                index = json.load(file)
+            if index["image"] != self.getImageStat():
+                return False
+            self.levels = [tuple(level) for level in index["levels"]]
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def getTileCount(self, level: int) -> tuple:
+        '''
+        Return the number of (rows, columns) of tiles in level.
+        '''
+        width, height = self.levels[level]
+        return -(-height // self.TILE_SIZE), -(-width // self.TILE_SIZE)
+
+    def getTileImage(self, level: int, row: int, column: int) -> QtGui.QImage:
+        if self.folder is None:
+            return self.tiles[(level, row, column)]
+        return QtGui.QImage(self.getTilePath(level, row, column))
+
+    def storeTile(self, level: int, row: int, column: int, image: QtGui.QImage):
+        if self.folder is None:
+            self.tiles[(level, row, column)] = image
+        else:
+            path = self.getTilePath(level, row, column)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if not image.save(path, "PNG", self.PNG_QUALITY):
+                raise OSError(f"could not write map tile '{path}'")
+
+    def build(self):
+        '''
+        Build all levels. Level 0 is cut from the image, the tiles of every further level are made from 2x2 tiles
+        of the previous level, so only the image and a few tiles are in memory at the same time.
+        '''
+        image = QtGui.QImage(self.image_path)
+        self.levels = [(image.width(), image.height())]
+        width, height = self.levels[0]
+        while width > self.TILE_SIZE or height > self.TILE_SIZE:
+            width, height = -(-width // 2), -(-height // 2)
+            self.levels.append((width, height))
+
+        try:
+            tile_format = QtGui.QImage.Format.Format_Grayscale8 if image.isGrayscale() else QtGui.QImage.Format.Format_RGB32
+            rows, columns = self.getTileCount(0)
+            for row in range(rows):
+                for column in range(columns):
+                    x, y = column * self.TILE_SIZE, row * self.TILE_SIZE
+                    rect = QtCore.QRect(x, y, min(self.TILE_SIZE, image.width() - x), min(self.TILE_SIZE, image.height() - y))
+                    self.storeTile(0, row, column, image.copy(rect).convertToFormat(tile_format))
+            del image
+
+            for level in range(1, len(self.levels)):
+                self.buildLevel(level, tile_format)
+
+            if self.folder is not None:
+                # index is written last, an aborted build is built again next time
+                index_path = self.getIndexPath()
+                temp_path = f"{index_path}.{os.getpid()}.tmp"
+                with open(temp_path, "w") as file:
+                    json.dump({"image": self.getImageStat(), "levels": self.levels}, file)
+                os.replace(temp_path, index_path)
+        except OSError as e:
+            if self.folder is None:
+                raise
+            # e.g. map folder is read-only, keep the pyramid in memory instead
+            print(f"could not cache map tiles on disk, keeping them in memory: {e}")
+            self.folder = None
+            self.tiles = {}
+            self.build()
+
+    def buildLevel(self, level: int, tile_format: QtGui.QImage.Format):
+        previous_rows, previous_columns = self.getTileCount(level - 1)
+        width, height = self.levels[level]
+        rows, columns = self.getTileCount(level)
+        for row in range(rows):
+            for column in range(columns):
+                tile_width = min(self.TILE_SIZE, width - column * self.TILE_SIZE)
+                tile_height = min(self.TILE_SIZE, height - row * self.TILE_SIZE)
+                mosaic = QtGui.QImage(2 * self.TILE_SIZE, 2 * self.TILE_SIZE, QtGui.QImage.Format.Format_RGB32)
+                mosaic_width, mosaic_height = 0, 0
+                painter = QtGui.QPainter(mosaic)
+                for previous_row in range(2 * row, min(2 * row + 2, previous_rows)):
+                    for previous_column in range(2 * column, min(2 * column + 2, previous_columns)):
+                        tile = self.getTileImage(level - 1, previous_row, previous_column)
+                        x = (previous_column - 2 * column) * self.TILE_SIZE
+                        y = (previous_row - 2 * row) * self.TILE_SIZE
+                        painter.drawImage(x, y, tile)
+                        mosaic_width = max(mosaic_width, x + tile.width())
+                        mosaic_height = max(mosaic_height, y + tile.height())
+                painter.end()
+                tile = mosaic.copy(0, 0, mosaic_width, mosaic_height).scaled(
+                    tile_width, tile_height, QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                    QtCore.Qt.TransformationMode.SmoothTransformation)
+                self.storeTile(level, row, column, tile.convertToFormat(tile_format))
+
+
+class ArenaGraphicsMapItem(QtWidgets.QGraphicsItem):
+    '''
+    Shows an occupancy map image in the background of a scene, in the coordinates given by a map.yaml file.
+    The image is drawn from a MapTilePyramid: the level is chosen by the current zoom and only tiles in the exposed
+    area are loaded. Loaded tiles are kept in a limited cache.
+    The y axis is flipped while painting instead of copying the whole image.
+    '''
+    MAX_CACHED_TILES = 128
+
+    def __init__(self, image_path: str, resolution: float, origin: list, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setZValue(-1.0)  # make sure map is always in the background
+        self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)  # needed for exposedRect
+        self.setScale(resolution)
+        self.pyramid = MapTilePyramid(image_path)
+        self.imageWidth, self.imageHeight = self.pyramid.levels[0]
+        # item coordinates are pixels, offset by the origin
+        self.offset = QtCore.QPointF(origin[0] / resolution, origin[1] / resolution)
+        self.pixmaps = collections.OrderedDict()  # key: (level, row, column), value: QPixmap, least recently used first
+
+    def boundingRect(self) -> QtCore.QRectF:
+        return QtCore.QRectF(self.offset.x(), self.offset.y(), self.imageWidth, self.imageHeight)
+
+    def imageToItem(self) -> QtGui.QTransform:
+        # image row 0 is the top of the map, but the y axis of the scene points up
+        return QtGui.QTransform(1.0, 0.0, 0.0, -1.0, self.offset.x(), self.offset.y() + self.imageHeight)
+
+    def getLevel(self, level_of_detail: float) -> int:
+        '''
+        Return the pyramid level with the lowest resolution that still has at least one pixel per screen pixel.
+        '''
+        if level_of_detail <= 0.0:
+            return len(self.pyramid.levels) - 1
+        level = int(math.floor(math.log2(1.0 / level_of_detail)))
+        return min(max(level, 0), len(self.pyramid.levels) - 1)
+
+    def getPixmap(self, level: int, row: int, column: int) -> QtGui.QPixmap:
+        key = (level, row, column)
+        if key in self.pixmaps:
+            self.pixmaps.move_to_end(key)
+            return self.pixmaps[key]
+        pixmap = QtGui.QPixmap.fromImage(self.pyramid.getTileImage(level, row, column))
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.MAX_CACHED_TILES:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem, widget=None):
+        if self.imageWidth == 0 or self.imageHeight == 0:
+            return
+        level = self.getLevel(QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform()))
+        scale = 2 ** level
+        tile_size = MapTilePyramid.TILE_SIZE * scale  # in image pixels
+        transform = self.imageToItem()
+        exposed_rect = option.exposedRect
+        if painter.hasClipping():
+            exposed_rect = exposed_rect.intersected(painter.clipBoundingRect())
+        exposed_rect = transform.inverted()[0].mapRect(exposed_rect)
+        rows, columns = self.pyramid.getTileCount(level)
+        first_row = max(int(exposed_rect.top() // tile_size), 0)
+        last_row = min(int(exposed_rect.bottom() // tile_size), rows - 1)
+        first_column = max(int(exposed_rect.left() // tile_size), 0)
+        last_column = min(int(exposed_rect.right() // tile_size), columns - 1)
+
+        painter.save()
+        painter.setTransform(transform, True)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                pixmap = self.getPixmap(level, row, column)
+                x, y = column * tile_size, row * tile_size
+                # the last tiles of a level can cover a bit more than the image because of rounding
+                target = QtCore.QRectF(x, y, min(pixmap.width() * scale, self.imageWidth - x),
+                                       min(pixmap.height() * scale, self.imageHeight - y))
+                painter.drawPixmap(target, pixmap, QtCore.QRectF(pixmap.rect()))
+        painter.restore()
+
+
+def replace_map_item(scene: QtWidgets.QGraphicsScene, old_map_item: ArenaGraphicsMapItem, map_data) -> ArenaGraphicsMapItem:
+    '''
+    Remove old_map_item (can be None) from scene and add an item for the map described by map_data (a RosMapData).
+    '''
+    if old_map_item is not None:
+        scene.removeItem(old_map_item)
+    map_item = ArenaGraphicsMapItem(map_data.image_path, map_data.resolution, map_data.origin)
+    scene.addItem(map_item)
+    return map_item
+
+
+
 class ArenaQGraphicsView(QtWidgets.QGraphicsView):
     '''
     A custom QGraphicsView.
@@ -687,7 +1025,8 @@ class ArenaQGraphicsView(QtWidgets.QGraphicsView):
         self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.setSceneRect(-200, -200, 400, 400)
         self.zoomFactor = 1.0
-        self.setViewportUpdateMode(QtWidgets.QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        # only repaint the changed areas, Qt chooses between minimal and bounding rect updates
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
 
         # add coordinate system lines
         pen = QtGui.QPen()
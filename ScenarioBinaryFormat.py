@@ -0,0 +1,145 @@
+"""
+Binary scenario format (.arenabin) for loading many scenarios quickly, e.g. at episode resets during training.
+
+Layout of a file, all numbers little-endian:
+    header      magic b"ARENABIN", version (uint32), flags (uint32), directory offset (uint64), directory length (uint64)
+    arrays      packed numpy arrays, each starting at a multiple of 64 bytes
+    directory   UTF-8 JSON with the offset, dtype and shape of every array and all strings of the scenario
+
+Pedsim agents are stored column by column like in a PedsimAgentTable, so loading maps the arrays from the file
+with np.memmap without copying or parsing them.
+"""
+import json
+import struct
+from typing import Tuple
+
+import numpy as np
+
+from PedsimAgentTable import *
+
+BINARY_SCENARIO_FILE_ENDING = ".arenabin"
+BINARY_SCENARIO_MAGIC = b"ARENABIN"
+BINARY_SCENARIO_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+_ALIGNMENT = 64
+
+
+class _ArrayWriter():
+    '''
+    Collect arrays for a binary scenario file and remember where each one will be stored.
+    '''
+    def __init__(self):
+        self.arrays = []  # list of (offset, bytes)
+        self.directory = {}  # key: array name, value: dict with offset, dtype and shape
+        self.end = _HEADER.size
+
+    def add(self, name: str, array: np.ndarray, dtype: str):
+        array = np.ascontiguousarray(array, dtype=dtype)
+        offset = -(-self.end // _ALIGNMENT) * _ALIGNMENT
+        self.arrays.append((offset, array.tobytes()))
+        self.directory[name] = {"offset": offset, "dtype": dtype, "shape": list(array.shape)}
+        self.end = offset + array.nbytes
+
+
+def save_binary_scenario(scenario_dict: dict, path: str):
+    '''
+    Save a scenario, given as returned by ArenaScenario.toDict(), in the binary format.
+    '''
+    with open(path, "wb") as file:
+        file.write(pack_binary_scenario(scenario_dict))
+
+
+def pack_binary_scenario(scenario_dict: dict) -> bytes:
+    '''
+    Return a scenario, given as returned by ArenaScenario.toDict(), in the binary format.
+    '''
+    agents = PedsimAgentTable.fromDicts(scenario_dict["pedsim_agents"], convert_paths=False)
+    obstacles = scenario_dict.get("static_obstacles", [])
+
+    writer = _ArrayWriter()
+    for field_name, column in agents.columns.items():
+        if field_name in agents.categories:
+            writer.add("agents/" + field_name, column, "<i4")
+        elif column.dtype.kind == "f":
+            writer.add("agents/" + field_name, column, "<f8")
+        else:
+            writer.add("agents/" + field_name, column, "<i8")
+    writer.add("agents/waypoint_offsets", agents.waypoint_offsets, "<i8")
+    writer.add("agents/waypoint_coords", agents.waypoint_coords, "<f8")
+    writer.add("obstacles/pos", np.array([o["pos"] for o in obstacles], dtype=float).reshape(-1, 2), "<f8")
+    writer.add("obstacles/angle", np.array([o["angle"] for o in obstacles], dtype=float), "<f8")
+
+    scenario = {key: value for key, value in scenario_dict.items() if key not in ["pedsim_agents", "static_obstacles"]}
+    directory = {
+        "arrays": writer.directory,
+        "scenario": scenario,
+        "agents": {
+            "number": len(agents),
+            "names": agents.names,
+            "categories": agents.categories,
+        },
+        "obstacles": {
+            "names": [o["name"] for o in obstacles],
+            "model_paths": [o["model_path"] for o in obstacles],
+        },
+    }
+    directory_bytes = json.dumps(directory, separators=(",", ":")).encode("utf-8")
+
+    buffer = bytearray(writer.end + len(directory_bytes))
+    buffer[:_HEADER.size] = _HEADER.pack(BINARY_SCENARIO_MAGIC, BINARY_SCENARIO_VERSION, 0, writer.end,
+                                         len(directory_bytes))
+    for offset, data in writer.arrays:
+        buffer[offset:offset + len(data)] = data
+    buffer[writer.end:] = directory_bytes
+    return bytes(buffer)
+
+
+def load_binary_scenario(path: str) -> Tuple[dict, PedsimAgentTable]:
+    '''
+    Load a binary scenario file.
+    Returns the scenario as a dict in the format of ArenaScenario.toDict() without pedsim agents,
+    and the pedsim agents as a PedsimAgentTable whose arrays are copy-on-write maps of the file.
+    '''
+    return unpack_binary_scenario(np.memmap(path, dtype=np.uint8, mode="c"), path)
+
+
+def unpack_binary_scenario(buffer: np.ndarray, name: str = "buffer") -> Tuple[dict, PedsimAgentTable]:
+    '''
+    Same as load_binary_scenario() for a scenario in the binary format that is already in memory or mapped.
+    - buffer: uint8 array, the arrays of the agent table will be views of it
+    - name: used in error messages
+    '''
+    magic, version, _, directory_offset, directory_length = _HEADER.unpack(bytes(buffer[:_HEADER.size]))
+    if magic != BINARY_SCENARIO_MAGIC:
+        raise Exception(f"'{name}' is not a binary scenario.")
+    if version > BINARY_SCENARIO_VERSION:
+        raise Exception(f"binary scenario file version {version} is not supported, update arena-tools.")
+    directory = json.loads(bytes(buffer[directory_offset:directory_offset + directory_length]).decode("utf-8"))
+
+    def get_array(name: str) -> np.ndarray:
+        entry = directory["arrays"][name]
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"]))
+        start = entry["offset"]
+        return buffer[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+
+    agents = PedsimAgentTable(0)
+    agents.names = directory["agents"]["names"]
+    for field_name in list(agents.columns.keys()):
+        agents.columns[field_name] = get_array("agents/" + field_name)
+    agents.categories = directory["agents"]["categories"]
+    # model paths are converted to the current user when loading, like in PedsimAgent.fromDict()
+    agents.categories["yaml_file"] = [get_current_user_path(path) for path in agents.categories["yaml_file"]]
+    agents.waypoint_offsets = get_array("agents/waypoint_offsets")
+    agents.waypoint_coords = get_array("agents/waypoint_coords")
+
+    scenario = dict(directory["scenario"])
+    scenario["pedsim_agents"] = []
+    obstacle_positions = get_array("obstacles/pos").tolist()
+    obstacle_angles = get_array("obstacles/angle").tolist()
+    scenario["static_obstacles"] = [
+        {"name": name, "model_path": model_path, "pos": pos, "angle": angle}
+        for name, model_path, pos, angle in zip(directory["obstacles"]["names"], directory["obstacles"]["model_paths"],
+                                                obstacle_positions, obstacle_angles)
+    ]
+    return scenario, agents
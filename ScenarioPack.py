@@ -0,0 +1,235 @@
+"""
+Scenario packs (.arenapack) bundle many scenarios with the flatland models and maps they use in a single file,
+so a whole curriculum can be copied to another machine at once.
+
+Layout of a pack, all numbers little-endian:
+    header      magic b"ARENAPAK", version (uint32), flags (uint32), number of scenarios (uint64),
+                table of contents offset (uint64), asset index offset (uint64), asset index length (uint64)
+    scenarios   one binary scenario (see ScenarioBinaryFormat.py) per scenario, each starting at a multiple of 64 bytes
+    assets      content of the model files, map.yaml files and map images
+    toc         (number of scenarios, 2) uint64 array with offset and length of every scenario
+    asset index UTF-8 JSON, key: asset name (e.g. "maps/map1/map.yaml"), value: [offset, length]
+
+Paths in the packed scenarios are asset names. When a scenario is loaded, they are replaced by the paths of the assets
+extracted into the asset folder of the pack, which happens once on first use.
+"""
+import argparse
+import json
+import os
+import struct
+from typing import List
+
+import numpy as np
+
+from ArenaScenario import *
+
+SCENARIO_PACK_FILE_ENDING = ".arenapack"
+SCENARIO_PACK_MAGIC = b"ARENAPAK"
+SCENARIO_PACK_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQQ")
+_ALIGNMENT = 64
+
+
+class _AssetCollector():
+    '''
+    Assign a unique asset name to every file referenced by the packed scenarios.
+    '''
+    def __init__(self):
+        self.names = {}  # key: resolved file path, value: asset name
+        self.contents = {}  # key: asset name, value: file content (bytes)
+
+    def _add(self, path: str, name: str, content: bytes = None) -> str:
+        resolved_path = os.path.realpath(path)
+        if resolved_path in self.names:
+            return self.names[resolved_path]
+        # make name unique if different files have the same name
+        stem, ending = os.path.splitext(name)
+        unique_name = name
+        i = 1
+        while unique_name in self.contents:
+            unique_name = f"{stem}_{i}{ending}"
+            i += 1
+        if content is None:
+            with open(path, "rb") as file:
+                content = file.read()
+        self.names[resolved_path] = unique_name
+        self.contents[unique_name] = content
+        return unique_name
+
+    def addModel(self, path: str) -> str:
+        if path == "" or not os.path.exists(path):
+            return path
+        return self._add(path, "models/" + os.path.basename(path))
+
+    def addMap(self, map_yaml_path: str) -> str:
+        '''
+        Add map.yaml together with its image and map.world.yaml (if it exists). Returns the asset name of map.yaml.
+        '''
+        if map_yaml_path == "" or not os.path.exists(map_yaml_path):
+            return map_yaml_path
+        resolved_path = os.path.realpath(map_yaml_path)
+        if resolved_path in self.names:
+            return self.names[resolved_path]
+
+        map_folder = os.path.dirname(map_yaml_path)
+        folder_name = "maps/" + os.path.basename(map_folder)
+        while folder_name + "/map.yaml" in self.contents:
+            folder_name += "_"
+        with open(map_yaml_path, "r") as file:
+            map_data = load_yaml(file)
+        image_path = os.path.join(map_folder, map_data["image"])
+        # the image is stored next to map.yaml, so it has to be referenced by its file name only
+        image_name = os.path.basename(image_path)
+        content = None
+        if image_name != map_data["image"]:
+            map_data["image"] = image_name
+            content = dump_yaml(map_data, sort_keys=False).encode("utf-8")
+        name = self._add(map_yaml_path, folder_name + "/map.yaml", content)
+        self._add(image_path, folder_name + "/" + image_name)
+        world_path = os.path.join(map_folder, "map.world.yaml")
+        if os.path.exists(world_path):
+            self._add(world_path, folder_name + "/map.world.yaml")
+        return name
+
+
+def create_scenario_pack(scenario_paths: List[str], pack_path: str):
+    '''
+    Bundle scenario files (json, yaml or arenabin) and the models and maps they use into one pack file.
+    '''
+    assets = _AssetCollector()
+    toc = np.zeros((len(scenario_paths), 2), dtype="<u8")
+
+    with open(pack_path, "wb") as file:
+        file.write(b"\0" * _HEADER.size)
+        for i, scenario_path in enumerate(scenario_paths):
+            scenario = ArenaScenario()
+            scenario.loadFromFile(scenario_path)
+            data = scenario.toDict()
+            # reference assets instead of files on this machine
+            for agent in data["pedsim_agents"]:
+                agent["yaml_file"] = assets.addModel(agent["yaml_file"])
+            for obstacle in data["static_obstacles"]:
+                obstacle["model_path"] = assets.addModel(obstacle["model_path"])
+            data["map_path"] = assets.addMap(data["map_path"])
+
+            blob = pack_binary_scenario(data)
+            offset = -(-file.tell() // _ALIGNMENT) * _ALIGNMENT
+            file.seek(offset)
+            file.write(blob)
+            toc[i] = [offset, len(blob)]
+
+        asset_index = {}
+        for name, content in assets.contents.items():
+            asset_index[name] = [file.tell(), len(content)]
+            file.write(content)
+
+        toc_offset = -(-file.tell() // _ALIGNMENT) * _ALIGNMENT
+        file.seek(toc_offset)
+        file.write(toc.tobytes())
+        asset_index_offset = file.tell()
+        asset_index_bytes = json.dumps(asset_index, separators=(",", ":")).encode("utf-8")
+        file.write(asset_index_bytes)
+
+        file.seek(0)
+        file.write(_HEADER.pack(SCENARIO_PACK_MAGIC, SCENARIO_PACK_VERSION, 0, len(scenario_paths), toc_offset,
+                                asset_index_offset, len(asset_index_bytes)))
+
+
+def _file_has_content(path: str, content: np.ndarray) -> bool:
+    if not os.path.exists(path) or os.path.getsize(path) != len(content):
+        return False
+    # an asset of an older pack with the same name can have the same size
+    with open(path, "rb") as file:
+        return file.read() == content.tobytes()
+
+
+class ScenarioPack():
+    '''
+    Read access to a scenario pack. Loading a scenario only reads its table of contents entry and the scenario itself.
+    - asset_folder: folder the models and maps are extracted to, defaults to a folder next to the pack file
+    '''
+    def __init__(self, path: str, asset_folder: str = ""):
+        self.path = path
+        self.buffer = np.memmap(path, dtype=np.uint8, mode="c")
+        magic, version, _, number_of_scenarios, toc_offset, asset_index_offset, asset_index_length = _HEADER.unpack(
+            bytes(self.buffer[:_HEADER.size]))
+        if magic != SCENARIO_PACK_MAGIC:
+            raise Exception(f"'{path}' is not a scenario pack.")
+        if version > SCENARIO_PACK_VERSION:
+            raise Exception(f"scenario pack version {version} is not supported, update arena-tools.")
+        self.toc = self.buffer[toc_offset:toc_offset + number_of_scenarios * 16].view("<u8").reshape(-1, 2)
+        self.asset_index = json.loads(
+            bytes(self.buffer[asset_index_offset:asset_index_offset + asset_index_length]).decode("utf-8"))
+        if asset_folder == "":
+            asset_folder = os.path.splitext(os.path.abspath(path))[0] + "_assets"
+        self.asset_folder = asset_folder
+        self.assets_extracted = False
+
+    def __len__(self):
+        return len(self.toc)
+
+    def getAssetNames(self) -> List[str]:
+        return list(self.asset_index.keys())
+
+    def extractAssets(self):
+        '''
+        Write all assets into the asset folder. Files that already exist with the same content are not written again.
+        '''
+        for name, (offset, length) in self.asset_index.items():
+            path = os.path.join(self.asset_folder, *name.split("/"))
+            if _file_has_content(path, self.buffer[offset:offset + length]):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temporary file first, other processes might read the same asset folder
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(self.buffer[offset:offset + length].tobytes())
+            os.replace(temp_path, path)
+        self.assets_extracted = True
+
+    def getAssetPath(self, name: str) -> str:
+        '''
+        Return the path of the extracted asset. If name is not an asset of this pack (e.g. a file that didn't exist
+        when the pack was created), it is a path on the machine the pack was created on and is converted to the
+        current user like paths in scenario files.
+        '''
+        if name not in self.asset_index:
+            return get_current_user_path(name)
+        if not self.assets_extracted:
+            self.extractAssets()
+        return os.path.join(self.asset_folder, *name.split("/"))
+
+    def getScenarioData(self, index: int):
+        '''
+        Return scenario index as dict (without pedsim agents) and PedsimAgentTable with paths to the extracted assets.
+        '''
+        offset, length = self.toc[index].tolist()
+        data, table = unpack_binary_scenario(self.buffer[offset:offset + length], f"{self.path}[{index}]")
+        table.categories["yaml_file"] = [self.getAssetPath(name) for name in table.categories["yaml_file"]]
+        for obstacle in data["static_obstacles"]:
+            obstacle["model_path"] = self.getAssetPath(obstacle["model_path"])
+        data["map_path"] = self.getAssetPath(data["map_path"])
+        return data, table
+
+    def getScenario(self, index: int, columnar: bool = False) -> ArenaScenario:
+        data, table = self.getScenarioData(index)
+        scenario = ArenaScenario()
+        # paths are already valid on this machine, the asset folder might be inside the home folder of another user
+        scenario.loadFromDictAndTable(data, table, columnar, convert_paths=False)
+        return scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle scenarios and the models and maps they use into one file.")
+    parser.add_argument("pack", help=f"path of the pack file to create, should end with {SCENARIO_PACK_FILE_ENDING}")
+    parser.add_argument("scenarios", nargs="+", help="scenario files (json, yaml or arenabin)")
+    args = parser.parse_args()
+
+    create_scenario_pack(args.scenarios, args.pack)
+    pack = ScenarioPack(args.pack)
+    print(f"Packed {len(pack)} scenarios and {len(pack.getAssetNames())} model and map files "
+          f"into {args.pack} ({os.path.getsize(args.pack) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Round trip tests for binary scenarios (.arenabin) against the JSON and YAML scenario formats.
+Run with: python -m pytest test_scenario_binary_format.py
+"""
+import json
+import os
+
+import pytest
+import yaml
+
+from ArenaScenario import *
+
+EXAMPLE_SCENARIO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "examples", "example_scenario.json")
+
+MODEL_YAML = """bodies:
+- name: base
+  color: [1, 0.2, 0.1, 1.0]
+  type: dynamic
+  footprints:
+  - type: circle
+    radius: 0.3
+    center: [0, 0]
+    layers: [all]
+    collision: true
+    density: 1
+"""
+
+
+def get_example_scenario_dict(folder: str) -> dict:
+    '''
+    Return the example scenario with a static obstacle whose model is saved in folder.
+    '''
+    model_path = os.path.join(folder, "obstacle.model.yaml")
+    with open(model_path, "w") as file:
+        file.write(MODEL_YAML)
+    with open(EXAMPLE_SCENARIO_PATH, "r") as file:
+        d = json.load(file)
+    d["static_obstacles"] = [
+        {"name": "obstacle 0", "model_path": model_path, "pos": [1.5, -2.25], "angle": 0.3},
+        {"name": "obstacle 1", "model_path": model_path, "pos": [0.0, 4.0], "angle": -1.2},
+    ]
+    d["resets"] = 3
+    return d
+
+
+def get_empty_scenario_dict() -> dict:
+    return {
+        "pedsim_agents": [],
+        "static_obstacles": [],
+        "robot_position": [0.5, 1.0],
+        "robot_goal": [2.0, 3.5],
+        "map_path": "",
+    }
+
+
+def save_scenario_dict(d: dict, path: str):
+    with open(path, "w") as file:
+        if path.endswith(".json"):
+            json.dump(d, file, indent=4)
+        else:
+            yaml.dump(d, file, default_flow_style=None)
+
+
+def get_scenario_dict(name: str, folder: str) -> dict:
+    if name == "example":
+        return get_example_scenario_dict(folder)
+    return get_empty_scenario_dict()
+
+
+@pytest.mark.parametrize("scenario_name", ["example", "empty"])
+@pytest.mark.parametrize("file_ending", [".json", ".yaml"])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_round_trip(tmp_path, scenario_name: str, file_ending: str, columnar: bool):
+    folder = str(tmp_path)
+    text_path = os.path.join(folder, "scenario" + file_ending)
+    binary_path = os.path.join(folder, "scenario" + BINARY_SCENARIO_FILE_ENDING)
+    save_scenario_dict(get_scenario_dict(scenario_name, folder), text_path)
+
+    scenario = ArenaScenario()
+    scenario.loadFromFile(text_path)
+    # saveToFile() only uses its argument for existing files
+    scenario.path = binary_path
+    assert scenario.saveToFile()
+
+    loaded_scenario = ArenaScenario()
+    loaded_scenario.loadFromFile(binary_path, columnar)
+    assert loaded_scenario.toDict() == scenario.toDict()
+    assert (loaded_scenario.pedsimAgentTable is not None) == columnar
+    assert len(loaded_scenario.getPedsimAgents()) == len(scenario.pedsimAgents)
+
+
+@pytest.mark.parametrize("file_ending", [".json", ".yaml"])
+def test_save_binary_as_text(tmp_path, file_ending: str):
+    # a scenario loaded from a binary file can be saved in the text formats again without changes
+    folder = str(tmp_path)
+    binary_path = os.path.join(folder, "scenario" + BINARY_SCENARIO_FILE_ENDING)
+    text_path = os.path.join(folder, "scenario" + file_ending)
+    scenario = ArenaScenario.fromDict(get_example_scenario_dict(folder))
+    scenario.path = binary_path
+    assert scenario.saveToFile()
+
+    loaded_scenario = ArenaScenario()
+    loaded_scenario.loadFromFile(binary_path, columnar=True)
+    save_scenario_dict(loaded_scenario.toDict(), text_path)
+    reloaded_scenario = ArenaScenario()
+    reloaded_scenario.loadFromFile(text_path)
+    assert reloaded_scenario.toDict() == scenario.toDict()
@@ -0,0 +1,69 @@
+"""Compares the nearest node lookup of MapGeneration.NodeIndex with the linear scan MapGeneration.find_nearest_node
+while growing a tree the same way create_indoor_map does.
+
+Usage: python utils/benchmark_nearest_node.py [--nodes 5000] [--size 2000]
+"""
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from MapGeneration import NodeIndex, find_nearest_node
+
+
+def sample_positions(number: int, size: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return [[int(x), int(y)] for x, y in rng.integers(0, size, (number, 2))]
+
+
+def grow_linear(root, positions):
+    tree = [root]
+    nearest_nodes = []
+    for position in positions:
+        nearest_nodes.append(find_nearest_node(position, tree))
+        tree.append(position)
+    return nearest_nodes
+
+
+def grow_index(root, positions):
+    tree = NodeIndex(len(positions) + 1)
+    tree.append(root)
+    nearest_nodes = []
+    for position in positions:
+        nearest_nodes.append(tree.nearest(position))
+        tree.append(position)
+    return nearest_nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=5000, help="number of nodes inserted into the tree")
+    parser.add_argument("--size", type=int, default=2000, help="width and height of the map")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    root = [args.size // 2, args.size // 2]
+    positions = sample_positions(args.nodes, args.size, args.seed)
+
+    start = time.perf_counter()
+    index_result = grow_index(root, positions)
+    index_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear_result = grow_linear(root, positions)
+    linear_time = time.perf_counter() - start
+
+    assert index_result == linear_result, "NodeIndex and linear scan found different nearest nodes"
+
+    print(f"{args.nodes} nodes on a {args.size}x{args.size} map")
+    print(f"linear scan: {linear_time:8.3f}s")
+    print(f"NodeIndex:   {index_time:8.3f}s")
+    print(f"speedup:     {linear_time / index_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compares saving and loading a scenario with the pure Python json/yaml functions and with the helpers
+load_json/dump_json/load_yaml/dump_yaml (libyaml and orjson if available), using examples/example_scenario.json
+scaled up to many agents.
+
+Usage: python utils/benchmark_scenario_io.py [--agents 2000] [--repeat 3]
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from HelperFunctions import load_json, dump_json, load_yaml, dump_yaml
+
+EXAMPLE_SCENARIO = pathlib.Path(__file__).resolve().parent.parent / "examples" / "example_scenario.json"
+
+
+def get_scaled_scenario(number_of_agents: int) -> dict:
+    with open(EXAMPLE_SCENARIO, "r") as file:
+        scenario = json.load(file)
+    agents = scenario["pedsim_agents"]
+    scenario["pedsim_agents"] = [dict(agents[i % len(agents)], id=i, name=f"agent{i}")
+                                 for i in range(number_of_agents)]
+    scenario["static_obstacles"] = []
+    return scenario
+
+
+def measure(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_old_json(path, data):
+    with open(path, "w") as file:
+        json.dump(data, file, indent=4)
+
+
+def write_new_json(path, data):
+    with open(path, "w") as file:
+        dump_json(data, file)
+
+
+def read_old_json(path):
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def read_new_json(path):
+    with open(path, "r") as file:
+        return load_json(file)
+
+
+def write_old_yaml(path, data):
+    with open(path, "w") as file:
+        yaml.dump(data, file, default_flow_style=None)
+
+
+def write_new_yaml(path, data):
+    with open(path, "w") as file:
+        dump_yaml(data, file, default_flow_style=None)
+
+
+def read_old_yaml(path):
+    with open(path, "r") as file:
+        return yaml.safe_load(file)
+
+
+def read_new_yaml(path):
+    with open(path, "r") as file:
+        return load_yaml(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=2000, help="number of pedsim agents in the scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many runs is reported")
+    args = parser.parse_args()
+
+    data = get_scaled_scenario(args.agents)
+    print(f"scenario with {args.agents} agents, libyaml: {yaml.__with_libyaml__}")
+    print(f"{'':12}{'old':>10}{'new':>10}{'speedup':>10}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        json_path = str(pathlib.Path(folder) / "scenario.json")
+        yaml_path = str(pathlib.Path(folder) / "scenario.yaml")
+        cases = [
+            ("json save", lambda: write_old_json(json_path, data), lambda: write_new_json(json_path, data)),
+            ("json load", lambda: read_old_json(json_path), lambda: read_new_json(json_path)),
+            ("yaml save", lambda: write_old_yaml(yaml_path, data), lambda: write_new_yaml(yaml_path, data)),
+            ("yaml load", lambda: read_old_yaml(yaml_path), lambda: read_new_yaml(yaml_path)),
+        ]
+        for name, old, new in cases:
+            old_time = measure(old, args.repeat)
+            new_time = measure(new, args.repeat)
+            print(f"{name:12}{old_time:9.3f}s{new_time:9.3f}s{old_time / new_time:9.1f}x")
+
+        assert read_new_json(json_path) == data, "json round trip changed the scenario"
+        assert read_new_yaml(yaml_path) == data, "yaml round trip changed the scenario"
+
+
+if __name__ == "__main__":
+    main()
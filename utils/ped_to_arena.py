@@ -1,26 +1,38 @@
 """This file converts arena-scenarios, created in the pedsim-format, into the scenario format, originally used by arena-rosnav
+
+Usage: python utils/ped_to_arena.py INPUT [INPUT ...] -o OUTPUT_FOLDER [--workers N] [--force]
+INPUT can be a folder (all .json files in it are converted) or a glob pattern like "scenarios/eval_*.json".
+Converted files get the same file name as their input file. Files whose output is newer than the input are skipped.
+Inputs that would get the same output file, or whose output file would be one of the inputs, are not converted.
 """
 
+import argparse
+import glob
 import json
-from os import walk
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from typing import Iterator, List, Tuple
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from HelperFunctions import load_json
 
-# add the dir from which to convert the files and 'temp' to were the converted files should saved for further inspections
-dir = '/home/elias/Desktop/test'
-temp = '/home/elias/arena_ws/src/arena-rosnav/simulator_setup/scenarios/eval_feb_2022/temp'
+# results of convert_file
+CONVERTED = "converted"
+SKIPPED = "skipped"
+FAILED = "failed"
 
-filenames = next(walk(dir), (None, None, []))[2]
 
-for path_to_json_file in filenames:
-    # path_to_json_file = '/home/elias/catkin_ws/src/arena-rosnav-3D/simulator_setup/scenarios/ignc_obs05.json'
-    def import_scenario_json(path_to_json_file):
-        with open(path_to_json_file) as f:
-            return json.load(f)
-    json_ped = import_scenario_json(f'{dir}/{path_to_json_file}')
+def convert_scenario(json_ped: dict) -> dict:
+    '''
+    Convert a scenario in the pedsim-format (as saved by the scenario editor) into the arena-rosnav format.
+    '''
     scenario = {}
     x = {}
     x['scene_name'] = f'scenario_1'
     x['repeats'] = json_ped['resets']
-    obs_list = []
     dynamic_obstacles = {}
     watchers = {}
     for i, agent in enumerate(json_ped['pedsim_agents']):
@@ -50,5 +62,142 @@ for path_to_json_file in filenames:
     x['watchers'] = watchers
     scenario['scenarios'] = [x]
     # scenario['format'] = "not-arena-tools"
-    with open(f'{temp}/{path_to_json_file}', 'w') as fp:
-        json.dump(scenario, fp)
\ No newline at end of file
+    return scenario
+
+
+def is_up_to_date(input_path: str, output_path: str) -> bool:
+    try:
+        return os.stat(output_path).st_mtime_ns >= os.stat(input_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def convert_file(input_path: str, output_path: str, force: bool = False) -> Tuple[str, str, str]:
+    '''
+    Convert a single file. The output is written to a temporary file first and then moved to output_path,
+    so an aborted run never leaves half written files behind.
+    Returns (input_path, result, error message), result is one of CONVERTED, SKIPPED or FAILED.
+    '''
+    if not force and is_up_to_date(input_path, output_path):
+        return input_path, SKIPPED, ""
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(input_path, "r") as f:
+            json_ped = load_json(f)
+        with open(temp_path, "w") as fp:
+            fp.write(json.dumps(convert_scenario(json_ped)))
+        os.replace(temp_path, output_path)
+    except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return input_path, FAILED, f"{type(e).__name__}: {e}"
+    return input_path, CONVERTED, ""
+
+
+def _convert_file_job(job: tuple) -> Tuple[str, str, str]:
+    # unpack arguments for use with multiprocessing.Pool.imap_unordered
+    return convert_file(*job)
+
+
+def iterate_input_files(inputs: List[str]) -> Iterator[str]:
+    '''
+    Yield the files of all inputs. An input is either a folder, of which all .json files are used, or a glob pattern.
+    '''
+    for input in inputs:
+        if os.path.isdir(input):
+            with os.scandir(input) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(".json"):
+                        yield entry.path
+        else:
+            for path in glob.iglob(input):
+                if os.path.isfile(path):
+                    yield path
+
+
+def get_output_paths(input_paths: List[str], output_folder: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    '''
+    Assign an output file in output_folder to every input file.
+    Returns a list of (input path, output path) and a list of (input path, error message) for inputs that can't be
+    converted, because their output would overwrite an input file or another input has the same file name.
+    '''
+    resolved_inputs = {}  # key: resolved input path, value: input path
+    for path in input_paths:
+        # the same file can be matched by several inputs
+        resolved_inputs.setdefault(os.path.realpath(path), path)
+    by_name = {}  # key: file name, value: list of input paths
+    for path in resolved_inputs.values():
+        by_name.setdefault(os.path.basename(path), []).append(path)
+
+    outputs = []
+    errors = []
+    for name, paths in by_name.items():
+        output_path = os.path.join(output_folder, name)
+        if len(paths) > 1:
+            errors += [(path, f"{len(paths)} input files are named {name}, they would overwrite each other")
+                       for path in paths]
+        elif os.path.realpath(output_path) in resolved_inputs:
+            errors.append((paths[0], f"output {output_path} is an input file, choose another output folder"))
+        else:
+            outputs.append((paths[0], output_path))
+    return outputs, errors
+
+
+def convert_files(inputs: List[str], output_folder: str, workers: int = 1, force: bool = False,
+                  verbose: bool = False) -> dict:
+    '''
+    Convert all files of inputs (folders or glob patterns) into output_folder.
+    Returns the number of files for each result (CONVERTED, SKIPPED, FAILED).
+    '''
+    os.makedirs(output_folder, exist_ok=True)
+    outputs, errors = get_output_paths(list(iterate_input_files(inputs)), output_folder)
+    jobs = [(path, output_path, force) for path, output_path in outputs]
+    counts = {CONVERTED: 0, SKIPPED: 0, FAILED: len(errors)}
+    for path, error in errors:
+        print(f"failed to convert {path}: {error}", file=sys.stderr)
+
+    if workers == 1:
+        results = map(_convert_file_job, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(_convert_file_job, jobs, chunksize=16)
+
+    try:
+        for path, result, error in results:
+            counts[result] += 1
+            if result == FAILED:
+                print(f"failed to convert {path}: {error}", file=sys.stderr)
+            elif verbose:
+                print(f"{result} {path}")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert pedsim-format scenarios into the arena-rosnav scenario format.")
+    parser.add_argument("inputs", nargs="+", help="folders or glob patterns of scenario files")
+    parser.add_argument("-o", "--output", required=True, help="folder for the converted files")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="number of worker processes, 0 uses all CPU cores")
+    parser.add_argument("-f", "--force", action="store_true", help="also convert files whose output is up to date")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every file")
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+    start_time = time.perf_counter()
+    counts = convert_files(args.inputs, args.output, workers, args.force, args.verbose)
+    elapsed = time.perf_counter() - start_time
+
+    total = sum(counts.values())
+    print(f"{total} files in {elapsed:.2f}s ({total / elapsed if elapsed > 0 else 0.0:.1f} files/s): "
+          f"{counts[CONVERTED]} converted, {counts[SKIPPED]} up to date, {counts[FAILED]} failed")
+    if counts[FAILED] > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()